@@ -1,3 +1,4 @@
+import queue
 from enum import Enum, auto
 from typing import Any, Callable
 
@@ -28,45 +29,82 @@ class Event:
         self.data = data
 
 
+# Subscribers for each event type, and an immutable snapshot of them that is
+# iterated on publish so callbacks can (un)subscribe while being dispatched
+_subscribers: dict[EventType, list[Callable[[Event], None]]] = {
+    event_type: [] for event_type in EventType
+}
+_dispatch: dict[EventType, tuple[Callable[[Event], None], ...]] = {
+    event_type: () for event_type in EventType
+}
+# Callbacks posted from other threads, waiting to be called on the main thread
+_posted: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+
+
+def subscribe(
+    event_type: EventType, callback: Callable[[Event], None]
+) -> None:
+    """
+    Subscribe to an event type with a callback function
+    """
+    if callback not in _subscribers[event_type]:
+        _subscribers[event_type].append(callback)
+        _dispatch[event_type] = tuple(_subscribers[event_type])
+
+
+def unsubscribe(
+    event_type: EventType, callback: Callable[[Event], None]
+) -> None:
+    """
+    Unsubscribe from an event type
+    """
+    if callback in _subscribers[event_type]:
+        _subscribers[event_type].remove(callback)
+        _dispatch[event_type] = tuple(_subscribers[event_type])
+
+
+def publish(event: Event) -> None:
+    """
+    Publish an event to all subscribers
+    """
+    for callback in _dispatch[event.type]:
+        callback(event)
+
+
+def post_call(callback: Callable[[], None]) -> None:
+    """
+    Queue a callback to be called by the next call to dispatch_posted, on the
+    thread that dispatches. Safe to call from any thread.
+    """
+    _posted.put(callback)
+
+
+def dispatch_posted() -> None:
+    """
+    Call all queued callbacks, in the order they were posted, on the calling
+    thread
+    """
+    while True:
+        try:
+            callback = _posted.get_nowait()
+        except queue.Empty:
+            return
+        callback()
+
+
 class EventManager:
     """
-    Central event manager that handles pub/sub pattern for events
-    """
-
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(EventManager, cls).__new__(cls)
-            cls._instance._subscribers = {}
-            for event_type in EventType:
-                cls._instance._subscribers[event_type] = set()
-        return cls._instance
-
-    def subscribe(
-        self, event_type: EventType, callback: Callable[[Event], None]
-    ) -> None:
-        """
-        Subscribe to an event type with a callback function
-        """
-        self._subscribers[event_type].add(callback)
-
-    def unsubscribe(
-        self, event_type: EventType, callback: Callable[[Event], None]
-    ) -> None:
-        """
-        Unsubscribe from an event type
-        """
-        if callback in self._subscribers[event_type]:
-            self._subscribers[event_type].remove(callback)
-
-    def publish(self, event: Event) -> None:
-        """
-        Publish an event to all subscribers
-        """
-        for callback in self._subscribers[event.type]:
-            callback(event)
-
-
-# Create a singleton instance that can be imported
+    Central event manager that handles pub/sub pattern for events. Kept as a
+    thin namespace over the module-level functions, which hold the shared
+    state.
+    """
+
+    subscribe = staticmethod(subscribe)
+    unsubscribe = staticmethod(unsubscribe)
+    publish = staticmethod(publish)
+    post_call = staticmethod(post_call)
+    dispatch_posted = staticmethod(dispatch_posted)
+
+
+# Create an instance that can be imported
 event_manager = EventManager()
@@ -2,6 +2,7 @@ import json
 from enum import Enum
 
 import mido
+import numpy as np
 
 from Config import Config
 from EventManager import Event, EventType, event_manager
@@ -89,6 +90,14 @@ class MIDISonifier:
         Key.B: 71,
     }
 
+    # (Key, Scale, Mode) -> (lower notes reversed, upper notes), filled in
+    # for every combination once the class is defined.
+    _NOTE_TABLES: dict = {}
+
+    # Weather condition -> (Key, Scale, Mode), loaded lazily from the mapping
+    # file the first time the weather changes.
+    _WEATHER_MAP: dict = None
+
     def __init__(
         self,
         key: Key = None,
@@ -120,30 +129,88 @@ class MIDISonifier:
 
         self.scale_factor: int = scale_factor
         self.midi_out = mido.open_output(midi_port_name)
-        self.prev_state: dict = {}
 
-        selected_intervals = self.INTERVALS.get(
-            (self.scale, self.mode), self.INTERVALS[(Scale.MAJOR, Mode.IONIAN)]
+        # Reusable messages for each MIDI channel, updated in place before
+        # being sent to avoid building a new message for every note
+        self._note_on_messages = [
+            mido.Message("note_on", channel=channel) for channel in range(16)
+        ]
+        self._note_off_messages = [
+            mido.Message("note_off", channel=channel) for channel in range(16)
+        ]
+
+        # Raw (status, note, velocity) messages collected during an update and
+        # written out together. Ports backed by python-rtmidi accept raw
+        # messages directly, which skips building mido messages entirely.
+        self._tx_buf: list[tuple[int, int, int]] = []
+        self._send_raw = getattr(
+            getattr(self.midi_out, "_rt", None), "send_message", None
+        )
+
+        self._update_allowed_notes()
+        self._rebuild_pitch_tables(Config.num_double_pendulums)
+
+        self._register_event_handlers()
+
+    def _update_allowed_notes(self):
+        """
+        Look up the allowed notes in the lower and upper halves of the MIDI
+        range for the current key, scale, and mode.
+        """
+        self.lower_notes_reversed, self.upper_notes = self._NOTE_TABLES[
+            (self.key, self.scale, self.mode)
+        ]
+
+    @classmethod
+    def _compute_allowed_notes(
+        cls, key: Key, scale: Scale, mode: Mode
+    ) -> tuple[bytes, bytes]:
+        """
+        Compute the allowed notes in the lower half of the MIDI range (in
+        descending order) and in the upper half (in ascending order) for the
+        given key, scale, and mode.
+        """
+        selected_intervals = cls.INTERVALS.get(
+            (scale, mode), cls.INTERVALS[(Scale.MAJOR, Mode.IONIAN)]
         )
 
         # Allowed pitch classes (0-11) are determined by adding scale offsets modulo 12
-        base_key: int = self.KEYS[self.key]
+        base_key: int = cls.KEYS[key]
         allowed_classes = {
             (base_key + offset) % 12 for offset in selected_intervals
         }
 
-        # List of allowed notes in the upper half (64-127)
-        self.upper_notes = [
+        # Allowed notes in the upper half (64-127)
+        upper_notes = bytes(
             note for note in range(64, 128) if note % 12 in allowed_classes
-        ]
+        )
 
-        # List of allowed notes in the lower half (0-63)
-        lower_notes = [
-            note for note in range(0, 64) if note % 12 in allowed_classes
-        ]
-        self.lower_notes_reversed = list(reversed(lower_notes))
+        # Allowed notes in the lower half (0-63), highest first
+        lower_notes_reversed = bytes(
+            note for note in range(63, -1, -1) if note % 12 in allowed_classes
+        )
 
-        self._register_event_handlers()
+        return lower_notes_reversed, upper_notes
+
+    def _rebuild_pitch_tables(self, n: int):
+        """
+        Precompute the pitch assigned to each of the first n double pendulums,
+        one table for the lower (even) nodes and one for the upper (odd)
+        nodes.
+        """
+        # np.resize repeats the notes cyclically to fill n entries
+        self.pitch_lower = np.resize(
+            np.frombuffer(self.lower_notes_reversed, dtype=np.uint8), n
+        )
+        self.pitch_upper = np.resize(
+            np.frombuffer(self.upper_notes, dtype=np.uint8), n
+        )
+        # Indexed by node parity: even nodes play low, odd nodes play high.
+        # Kept as lists so lookups give plain ints for the MIDI messages.
+        self.pitch_tables = (
+            self.pitch_lower.tolist(),
+            self.pitch_upper.tolist(),
+        )
 
     def _register_event_handlers(self):
         """
@@ -153,11 +220,24 @@ class MIDISonifier:
             EventType.WEATHER_UPDATED, self._on_weather_changed
         )
 
+    def close(self):
+        """
+        Stop reacting to weather updates, silence any sounding notes, and
+        close the MIDI output port.
+        """
+        event_manager.unsubscribe(
+            EventType.WEATHER_UPDATED, self._on_weather_changed
+        )
+        self.midi_out.reset()
+        self.midi_out.close()
+
     def _on_weather_changed(self, event: Event):
         """
         Update key, scale, and mode based on the given weather condition.
         """
         self.set_key_scale_mode_from_weather(event.data["condition"])
+        self._update_allowed_notes()
+        self._rebuild_pitch_tables(len(self.pitch_lower))
         Config.key = self.key.value
         Config.scale = self.scale.value
         Config.mode = self.mode.value
@@ -170,58 +250,134 @@ class MIDISonifier:
         """
         Set the key, scale, and mode based on the given weather condition.
         """
+        if type(self)._WEATHER_MAP is None:
+            type(self)._WEATHER_MAP = self._load_weather_map()
+
+        self.key, self.scale, self.mode = type(self)._WEATHER_MAP[
+            weather_condition
+        ]
+
+    @staticmethod
+    def _load_weather_map() -> dict:
+        """
+        Load the weather music mapping file, resolving each entry to its
+        (Key, Scale, Mode) enum members.
+        """
         with open("weather_music_mapping.json") as f:
             weather_music_mapping = json.load(f)
-            self.key = Key[weather_music_mapping[weather_condition]["key"]]
-            self.scale = Scale[
-                weather_music_mapping[weather_condition]["scale"]
-            ]
-            self.mode = Mode[weather_music_mapping[weather_condition]["mode"]]
+
+        return {
+            condition: (
+                Key[settings["key"]],
+                Scale[settings["scale"]],
+                Mode[settings["mode"]],
+            )
+            for condition, settings in weather_music_mapping.items()
+        }
 
     def update(self, system: PendulumSystem) -> None:
         """
         For each double pendulum in the system, if any pendulum's node is active,
         send a MIDI note. Node active state is expected to be updated by the visualizer.
         """
-        for double_pendulum_idx, double_pendulum in enumerate(system):
-            pendulums: list[Pendulum] = double_pendulum.pendulums
+        released_notes = system.pop_released_notes()
+        _, node_active, angular_velocity, g = system.snapshot_dynamics()
+
+        # Nothing to play or stop
+        if (
+            system.sounding_count == 0
+            and not released_notes
+            and not node_active.any()
+        ):
+            return
+
+        double_pendulums = system.double_pendulums
+        if len(double_pendulums) > len(self.pitch_lower):
+            self._rebuild_pitch_tables(len(double_pendulums))
+
+        # Map the angular velocity of every pendulum, scaled for gravity, to a
+        # MIDI velocity in a chosen range (30–127) in a single pass over the
+        # system's state arrays
+        gravity_scaling = 9.81 / g[:, np.newaxis]
+        velocities = (
+            np.clip(
+                np.abs(angular_velocity) * gravity_scaling * 20,
+                30,
+                127,
+            )
+            .astype(np.uint8)
+            .tolist()
+        )
+
+        active = node_active.tolist()
+
+        tx_append = self._tx_buf.append
+        pitch_tables = self.pitch_tables
+
+        # Stop the notes of double pendulums removed from the system
+        for node_idx, pitch in released_notes:
+            tx_append((0x80 | node_idx, pitch, 64))
+
+        for double_pendulum_idx, double_pendulum in enumerate(
+            double_pendulums
+        ):
+            pendulums: tuple[Pendulum, ...] = double_pendulum.pendulums
             for node_idx, pendulum in enumerate(pendulums):
-                if pendulum.node.active:
-                    if node_idx % 2 == 0:
-                        allowed = self.lower_notes_reversed
-                    else:
-                        allowed = self.upper_notes
-
-                    assign_idx = double_pendulum_idx % len(allowed)
-                    pitch: int = allowed[assign_idx]
-
-                    ang_vel: float = abs(pendulum.angular_velocity)
-
-                    gravity_scaling = 9.81 / double_pendulum.g
-                    scaled_ang_vel = ang_vel * gravity_scaling
-                    # Map angular velocity to a MIDI velocity in a chosen range (30–127)
-                    velocity: int = min(127, max(30, int(scaled_ang_vel * 20)))
-                    self.play_note_on(node_idx, pitch, velocity)
+                node = pendulum.node
+                if active[double_pendulum_idx][node_idx]:
+                    pitch: int = pitch_tables[node_idx & 1][
+                        double_pendulum_idx
+                    ]
+                    velocity: int = velocities[double_pendulum_idx][node_idx]
+                    tx_append((0x90 | node_idx, pitch, velocity))
+                    node.prev_pitch = pitch
+                elif node.prev_pitch is not None:
+                    tx_append((0x80 | node_idx, node.prev_pitch, 64))
+                    node.prev_pitch = None
+
+        self._flush()
+
+    def _flush(self) -> None:
+        """
+        Send all MIDI messages buffered during the last update, in order.
+        """
+        if not self._tx_buf:
+            return
+
+        if self._send_raw is not None:
+            send_raw = self._send_raw
+            for message in self._tx_buf:
+                send_raw(message)
+        else:
+            for status, pitch, velocity in self._tx_buf:
+                if status & 0xF0 == 0x90:
+                    self.play_note_on(status & 0x0F, pitch, velocity)
                 else:
-                    prev_state = self.prev_state.get(
-                        (double_pendulum, node_idx)
-                    )
-                    if prev_state is not None:
-                        self.play_note_off(node_idx, prev_state)
-                        self.prev_state.pop((double_pendulum, node_idx))
+                    self.play_note_off(status & 0x0F, pitch)
+
+        self._tx_buf.clear()
 
     def play_note_on(self, channel: int, pitch: int, velocity: int) -> None:
         """
         Send a note on message for the specified channel, pitch, and velocity.
         """
-        note_on = mido.Message(
-            "note_on", channel=channel, note=pitch, velocity=velocity
-        )
+        note_on = self._note_on_messages[channel]
+        note_on.note = pitch
+        note_on.velocity = velocity
         self.midi_out.send(note_on)
 
     def play_note_off(self, channel: int, pitch: int) -> None:
         """
         Send a note off message for the specified channel and pitch.
         """
-        note_off = mido.Message("note_off", channel=channel, note=pitch)
+        note_off = self._note_off_messages[channel]
+        note_off.note = pitch
         self.midi_out.send(note_off)
+
+
+MIDISonifier._NOTE_TABLES = {
+    (key, scale, mode): MIDISonifier._compute_allowed_notes(key, scale, mode)
+    for key in MIDISonifier.KEYS
+    for scale in Scale
+    for mode in Mode
+}
@@ -1,9 +1,220 @@
 import math
 import random
+import threading
+
+import numpy as np
+from numba import njit
 
 from Config import Config
 
 MAX_ANGULAR_VELOCITY = 10.0
+DAMPING_FACTOR = 0.90  # Reduce angular velocity by 10% on a full spin
+
+
+@njit(cache=True, fastmath=True)
+def _accelerations(
+    a1: float,
+    a2: float,
+    w1: float,
+    w2: float,
+    m1: float,
+    m2: float,
+    L1: float,
+    L2: float,
+    g: float,
+) -> tuple[float, float]:
+    """
+    Computes the angular accelerations of the two pendulums of a double
+    pendulum from its equations of motion.
+    """
+    # Precompute common terms from the sines and cosines of both angles,
+    # using the angle-difference and double-angle identities
+    s1, c1 = math.sin(a1), math.cos(a1)
+    s2, c2 = math.sin(a2), math.cos(a2)
+    sin_delta = s1 * c2 - c1 * s2
+    cos_delta = c1 * c2 + s1 * s2
+    cos2delta = 1 - 2 * sin_delta * sin_delta
+    sin_a1_minus_2a2 = s1 * (2 * c2 * c2 - 1) - c1 * (2 * s2 * c2)
+    common_mass = 2 * m1 + m2
+
+    # Denominators
+    denom1 = L1 * (common_mass - m2 * cos2delta)
+    denom2 = L2 * (common_mass - m2 * cos2delta)
+
+    # Angular accelerations
+    d_w1 = (
+        -g * common_mass * s1
+        - m2 * g * sin_a1_minus_2a2
+        - 2 * sin_delta * m2 * (w2**2 * L2 + w1**2 * L1 * cos_delta)
+    ) / denom1
+
+    d_w2 = (
+        2
+        * sin_delta
+        * (
+            w1**2 * L1 * (m1 + m2)
+            + g * (m1 + m2) * c1
+            + w2**2 * L2 * m2 * cos_delta
+        )
+    ) / denom2
+
+    return d_w1, d_w2
+
+
+@njit(cache=True, fastmath=True)
+def _step(
+    angle: np.ndarray,
+    angular_velocity: np.ndarray,
+    mass: np.ndarray,
+    length: np.ndarray,
+    g: np.ndarray,
+    temperature_factor: np.ndarray,
+    dt: float,
+) -> None:
+    """
+    Computes one simulation step for a batch of double pendulums using Euler
+    integration. The pendulum arrays have shape (N, 2) and the g and
+    temperature_factor arrays have shape (N,). All arrays are updated in
+    place.
+    """
+    for i in range(angle.shape[0]):
+        a1, a2 = angle[i, 0], angle[i, 1]
+        w1, w2 = angular_velocity[i, 0], angular_velocity[i, 1]
+
+        d_w1, d_w2 = _accelerations(
+            a1,
+            a2,
+            w1,
+            w2,
+            mass[i, 0],
+            mass[i, 1],
+            length[i, 0],
+            length[i, 1],
+            g[i],
+        )
+
+        # Apply temperature factor to the acceleration, not to the accumulated velocity
+        # This prevents continuous acceleration over time
+        d_w1 *= temperature_factor[i]
+        d_w2 *= temperature_factor[i]
+
+        # Euler integration
+        w1 += d_w1 * dt
+        w2 += d_w2 * dt
+
+        # Clamp angular velocity to prevent excessive spinning
+        w1 = max(-MAX_ANGULAR_VELOCITY, min(w1, MAX_ANGULAR_VELOCITY))
+        w2 = max(-MAX_ANGULAR_VELOCITY, min(w2, MAX_ANGULAR_VELOCITY))
+
+        a1 += w1 * dt
+        a2 += w2 * dt
+
+        # Detect full spins for the first pendulum
+        if abs(a1) >= 2 * math.pi:
+            # Reduce angular velocity by the damping factor
+            w1 *= DAMPING_FACTOR
+
+            # Normalize the angle to keep it within [-2π, 2π]
+            a1 %= 2 * math.pi
+
+        angle[i, 0], angle[i, 1] = a1, a2
+        angular_velocity[i, 0], angular_velocity[i, 1] = w1, w2
+
+
+@njit(cache=True, fastmath=True)
+def _screen_coords(
+    angle: np.ndarray,
+    length: np.ndarray,
+    origin_x: float,
+    origin_y: float,
+    scale: float,
+    out: np.ndarray,
+) -> None:
+    """
+    Computes the screen coordinates of a batch of double pendulums into out,
+    which has shape (N, 3, 2): the origin followed by the end point of each
+    pendulum.
+    """
+    for i in range(angle.shape[0]):
+        x, y = origin_x, origin_y
+        out[i, 0, 0], out[i, 0, 1] = x, y
+        for j in range(2):
+            x += length[i, j] * scale * math.sin(angle[i, j])
+            y += length[i, j] * scale * math.cos(angle[i, j])
+            out[i, j + 1, 0], out[i, j + 1, 1] = x, y
+
+
+@njit(cache=True)
+def _update_nodes(
+    coords: np.ndarray,
+    origin_x: float,
+    threshold: float,
+    last_x: np.ndarray,
+    triggered: np.ndarray,
+    active: np.ndarray,
+) -> None:
+    """
+    Updates the node states of a batch of double pendulums from their screen
+    coordinates, as computed by _screen_coords. A node becomes active and
+    triggered when it crosses the origin, unless it is still triggered from
+    its last crossing, and is released once it moves far enough away. Nodes
+    without a last position (NaN) are only placed. The node arrays have shape
+    (N, 2) and are updated in place.
+    """
+    for i in range(last_x.shape[0]):
+        for j in range(2):
+            x = coords[i, j + 1, 0]
+            if not math.isnan(last_x[i, j]):
+                if (last_x[i, j] < origin_x) != (x < origin_x):
+                    if not triggered[i, j]:
+                        active[i, j] = True
+                        triggered[i, j] = True
+                else:
+                    active[i, j] = False
+
+                # Reset lock once the node moves far enough from the origin
+                if abs(x - origin_x) > threshold * 2:
+                    triggered[i, j] = False
+
+            last_x[i, j] = x
+
+
+class _StateField:
+    """
+    Exposes a value stored in a 0-d NumPy array as a Python scalar attribute
+    (a float unless another type is given). The array is kept in the
+    attribute of the same name prefixed with an underscore, so it can be a
+    view into the arrays of a PendulumSystem.
+    """
+
+    def __init__(self, type_: type = float):
+        self.type = type_
+
+    def __set_name__(self, owner, name):
+        self.storage_name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.type(getattr(instance, self.storage_name))
+
+    def __set__(self, instance, value: float) -> None:
+        getattr(instance, self.storage_name)[...] = value
+
+
+class _OptionalStateField(_StateField):
+    """
+    A float state field that can also be None, stored as NaN.
+    """
+
+    def __get__(self, instance, owner=None):
+        value = super().__get__(instance, owner)
+        if instance is None or not math.isnan(value):
+            return value
+        return None
+
+    def __set__(self, instance, value: float) -> None:
+        super().__set__(instance, math.nan if value is None else value)
 
 
 class Node:
@@ -11,10 +222,45 @@ class Node:
     Represents a node in a pendulum system.
     """
 
+    __slots__ = ("_active", "_triggered", "_last_x", "_prev_pitch", "_system")
+
+    active = _StateField(bool)
+    triggered = _StateField(bool)
+    last_x = _OptionalStateField()
+
     def __init__(self) -> None:
-        self.active: bool = False
-        self.triggered: bool = False
-        self.last_x: float = None
+        self._active = np.array(False)
+        self._triggered = np.array(False)
+        self._last_x = np.array(np.nan)
+        self._prev_pitch: int = None
+        # The system whose sounding count this node keeps up to date
+        self._system: PendulumSystem = None
+
+    def _bind(
+        self, active: np.ndarray, triggered: np.ndarray, last_x: np.ndarray
+    ) -> None:
+        """
+        Moves the state of the node into the given 0-d array views.
+        """
+        active[...] = self._active
+        triggered[...] = self._triggered
+        last_x[...] = self._last_x
+        self._active = active
+        self._triggered = triggered
+        self._last_x = last_x
+
+    @property
+    def prev_pitch(self) -> int:
+        return self._prev_pitch
+
+    @prev_pitch.setter
+    def prev_pitch(self, value: int) -> None:
+        system = self._system
+        if system is not None and (value is None) != (
+            self._prev_pitch is None
+        ):
+            system.sounding_count += 1 if value is not None else -1
+        self._prev_pitch = value
 
 
 class Pendulum:
@@ -22,6 +268,13 @@ class Pendulum:
     Represents a single pendulum in an N-pendulum system.
     """
 
+    __slots__ = ("_length", "_mass", "_angle", "_angular_velocity", "node")
+
+    length = _StateField()
+    mass = _StateField()
+    angle = _StateField()
+    angular_velocity = _StateField()
+
     def __init__(
         self,
         length: float = 1.0,
@@ -38,18 +291,53 @@ class Pendulum:
             angle: The angle of the pendulum.
             angular_velocity: The angular velocity of the pendulum.
         """
-        self.length = length
-        self.mass = mass
-        self.angle = angle
-        self.angular_velocity = angular_velocity
+        self._length = np.array(length, dtype=np.float64)
+        self._mass = np.array(mass, dtype=np.float64)
+        self._angle = np.array(angle, dtype=np.float64)
+        self._angular_velocity = np.array(angular_velocity, dtype=np.float64)
         self.node = Node()
 
+    def _bind(
+        self,
+        length: np.ndarray,
+        mass: np.ndarray,
+        angle: np.ndarray,
+        angular_velocity: np.ndarray,
+    ) -> None:
+        """
+        Moves the state of the pendulum into the given 0-d array views.
+        """
+        length[...] = self._length
+        mass[...] = self._mass
+        angle[...] = self._angle
+        angular_velocity[...] = self._angular_velocity
+        self._length = length
+        self._mass = mass
+        self._angle = angle
+        self._angular_velocity = angular_velocity
+
 
 class DoublePendulum:
     """
     Represents a double pendulum system.
     """
 
+    __slots__ = (
+        "pendulums",
+        "_g",
+        "_temperature_factor",
+        "_length",
+        "_mass",
+        "_angle",
+        "_angular_velocity",
+        "_node_active",
+        "_node_triggered",
+        "_node_last_x",
+    )
+
+    g = _StateField()
+    temperature_factor = _StateField()
+
     def __init__(
         self,
         g: float = 9.81,
@@ -68,7 +356,7 @@ class DoublePendulum:
             length_range: The range of length variation around 1.0.
             angle_range: The range of angle variation.
         """
-        self.pendulums = [
+        self.pendulums: tuple[Pendulum, Pendulum] = (
             Pendulum(
                 mass=random.uniform(1 - mass_range, 1 + mass_range),
                 length=random.uniform(1 - length_range, 1 + length_range),
@@ -79,8 +367,20 @@ class DoublePendulum:
                 length=random.uniform(1 - length_range, 1 + length_range),
                 angle=math.pi / 2 + random.uniform(*angle_range),
             ),
-        ]
-        self.g = g
+        )
+        self._g = np.array(g, dtype=np.float64)
+        self._temperature_factor = np.array(1.0)
+        self._bind(
+            np.empty(2),
+            np.empty(2),
+            np.empty(2),
+            np.empty(2),
+            np.empty(()),
+            np.empty(()),
+            np.empty(2, dtype=bool),
+            np.empty(2, dtype=bool),
+            np.empty(2),
+        )
 
         if temperature is not None:
             self.temperature_factor = self.calculate_temperature_factor(
@@ -89,9 +389,8 @@ class DoublePendulum:
         else:
             self.temperature_factor = 1.0
 
-    def calculate_temperature_factor(
-        self, temperature_celsius: float
-    ) -> float:
+    @staticmethod
+    def calculate_temperature_factor(temperature_celsius: float) -> float:
         """
         Calculates the temperature factor based on the provided temperature in Celsius.
         Factor ranges from 0.25 (cold) to 2.0 (hot).
@@ -104,88 +403,71 @@ class DoublePendulum:
         min_temperature = 0
         max_temperature = 35
 
-        if temperature_celsius <= min_temperature:
-            return min_temperature_factor
-        elif temperature_celsius >= max_temperature:
-            return max_temperature_factor
-        else:
-            # Linear interpolation between 0°C (0.25) and 35°C (2.0)
-            return min_temperature_factor + (
-                temperature_celsius / max_temperature
-            ) * (max_temperature_factor - min_temperature_factor)
+        # Linear interpolation between 0°C (0.25) and 35°C (2.0), clamped to
+        # that range
+        temperature_celsius = min(
+            max_temperature, max(min_temperature, temperature_celsius)
+        )
+        return min_temperature_factor + (
+            temperature_celsius / max_temperature
+        ) * (max_temperature_factor - min_temperature_factor)
 
-    def step(self, dt) -> None:
+    def _bind(
+        self,
+        length: np.ndarray,
+        mass: np.ndarray,
+        angle: np.ndarray,
+        angular_velocity: np.ndarray,
+        g: np.ndarray,
+        temperature_factor: np.ndarray,
+        node_active: np.ndarray,
+        node_triggered: np.ndarray,
+        node_last_x: np.ndarray,
+    ) -> None:
         """
-        Computes one simulation step for a double pendulum using Euler integration.
+        Moves the state of the double pendulum, its pendulums, and their nodes
+        into the given array views. The pendulum and node arrays have shape
+        (2,) and the g and temperature_factor arrays are 0-d.
         """
-        DAMPING_FACTOR = 0.90  # Reduce angular velocity by 10% on a full spin
-
-        p1: Pendulum = self.pendulums[0]
-        p2: Pendulum = self.pendulums[1]
-        m1, m2 = p1.mass, p2.mass
-        L1, L2 = p1.length, p2.length
-        a1, a2 = p1.angle, p2.angle
-        w1, w2 = p1.angular_velocity, p2.angular_velocity
-        g = self.g
-
-        # Precompute common terms
-        delta = a1 - a2
-        sin_delta = math.sin(delta)
-        cos_delta = math.cos(delta)
-        cos2delta = math.cos(2 * delta)
-        common_mass = 2 * m1 + m2
-
-        # Denominators
-        denom1 = L1 * (common_mass - m2 * cos2delta)
-        denom2 = L2 * (common_mass - m2 * cos2delta)
-
-        # Angular accelerations
-        d_w1 = (
-            -g * common_mass * math.sin(a1)
-            - m2 * g * math.sin(a1 - 2 * a2)
-            - 2 * sin_delta * m2 * (w2**2 * L2 + w1**2 * L1 * cos_delta)
-        ) / denom1
-
-        d_w2 = (
-            2
-            * sin_delta
-            * (
-                w1**2 * L1 * (m1 + m2)
-                + g * (m1 + m2) * math.cos(a1)
-                + w2**2 * L2 * m2 * cos_delta
+        g[...] = self._g
+        temperature_factor[...] = self._temperature_factor
+        self._g = g
+        self._temperature_factor = temperature_factor
+        self._length = length
+        self._mass = mass
+        self._angle = angle
+        self._angular_velocity = angular_velocity
+        self._node_active = node_active
+        self._node_triggered = node_triggered
+        self._node_last_x = node_last_x
+
+        for idx, pendulum in enumerate(self.pendulums):
+            pendulum._bind(
+                length[idx, ...],
+                mass[idx, ...],
+                angle[idx, ...],
+                angular_velocity[idx, ...],
+            )
+            pendulum.node._bind(
+                node_active[idx, ...],
+                node_triggered[idx, ...],
+                node_last_x[idx, ...],
             )
-        ) / denom2
-
-        # Apply temperature factor to the acceleration, not to the accumulated velocity
-        # This prevents continuous acceleration over time
-        d_w1 *= self.temperature_factor
-        d_w2 *= self.temperature_factor
-
-        # Euler integration
-        p1.angular_velocity += d_w1 * dt
-        p2.angular_velocity += d_w2 * dt
 
-        # Clamp angular velocity to prevent excessive spinning
-        p1.angular_velocity = max(
-            -MAX_ANGULAR_VELOCITY,
-            min(p1.angular_velocity, MAX_ANGULAR_VELOCITY),
-        )
-        p2.angular_velocity = max(
-            -MAX_ANGULAR_VELOCITY,
-            min(p2.angular_velocity, MAX_ANGULAR_VELOCITY),
+    def step(self, dt) -> None:
+        """
+        Computes one simulation step for a double pendulum using Euler integration.
+        """
+        _step(
+            self._angle[np.newaxis],
+            self._angular_velocity[np.newaxis],
+            self._mass[np.newaxis],
+            self._length[np.newaxis],
+            self._g[np.newaxis],
+            self._temperature_factor[np.newaxis],
+            dt,
         )
 
-        p1.angle += p1.angular_velocity * dt
-        p2.angle += p2.angular_velocity * dt
-
-        # Detect full spins for the first pendulum
-        if abs(p1.angle) >= 2 * math.pi:
-            # Reduce angular velocity by the damping factor
-            p1.angular_velocity *= DAMPING_FACTOR
-
-            # Normalize the angle to keep it within [-2π, 2π]
-            p1.angle %= 2 * math.pi
-
 
 class PendulumSystem:
     """
@@ -227,13 +509,123 @@ class PendulumSystem:
         self.mass_range = mass_range
         self.length_range = length_range
         self.angle_range = angle_range
+        self._rng = np.random.default_rng()
+        # Number of nodes that still have a note sounding. Lets consumers skip
+        # a frame entirely when nothing needs to be stopped.
+        self.sounding_count = 0
+        # (node index, pitch) of the notes still sounding on double pendulums
+        # removed from the system, left for the sonifier to stop
+        self._released_notes: list[tuple[int, int]] = []
+        # Held while the state arrays are reallocated, so other threads never
+        # see arrays of different lengths or not yet filled in
+        self._resize_lock = threading.Lock()
+
+        self._pack()
+
+    def _pack(self) -> None:
+        """
+        Gathers the state of all double pendulums into contiguous arrays
+        (one array per quantity) and rebinds the pendulums as views into them,
+        so that the whole system can be stepped with vectorized operations.
+        """
+        n = len(self.double_pendulums)
+        self._length = np.empty((n, 2))
+        self._mass = np.empty((n, 2))
+        self._angle = np.empty((n, 2))
+        self._angular_velocity = np.empty((n, 2))
+        self._g = np.empty(n)
+        self._temperature_factor = np.empty(n)
+        self._node_active = np.empty((n, 2), dtype=bool)
+        self._node_triggered = np.empty((n, 2), dtype=bool)
+        self._node_last_x = np.empty((n, 2))
+
+        for idx, double_pendulum in enumerate(self.double_pendulums):
+            double_pendulum._bind(
+                self._length[idx],
+                self._mass[idx],
+                self._angle[idx],
+                self._angular_velocity[idx],
+                self._g[idx, ...],
+                self._temperature_factor[idx, ...],
+                self._node_active[idx],
+                self._node_triggered[idx],
+                self._node_last_x[idx],
+            )
+            for pendulum in double_pendulum.pendulums:
+                pendulum.node._system = self
+
+    @property
+    def masses(self) -> np.ndarray:
+        """
+        The masses of the pendulums of every double pendulum, as a read-only
+        (N, 2) array.
+        """
+        masses = self._mass.view()
+        masses.flags.writeable = False
+        return masses
 
     def step(self, dt: float) -> None:
         """
         Advances each double pendulum system by dt.
         """
-        for double_pendulum in self.double_pendulums:
-            double_pendulum.step(dt)
+        _step(
+            self._angle,
+            self._angular_velocity,
+            self._mass,
+            self._length,
+            self._g,
+            self._temperature_factor,
+            dt,
+        )
+
+    def screen_coords(
+        self, origin: tuple[float, float], scale: float
+    ) -> np.ndarray:
+        """
+        Computes the screen coordinates of every double pendulum at once. The
+        result has shape (N, 3, 2) and holds, for each double pendulum, the
+        origin followed by the (x, y) end point of each of its pendulums.
+        """
+        coords = np.empty((len(self.double_pendulums), 3, 2))
+        _screen_coords(
+            self._angle, self._length, origin[0], origin[1], scale, coords
+        )
+        return coords
+
+    def update_nodes(
+        self, coords: np.ndarray, origin_x: float, threshold: float
+    ) -> None:
+        """
+        Updates the state of every node in the system at once from the screen
+        coordinates returned by screen_coords. A node becomes active and
+        triggered when it crosses origin_x, and is no longer triggered once it
+        moves more than twice the threshold away from it.
+        """
+        _update_nodes(
+            coords,
+            origin_x,
+            threshold,
+            self._node_last_x,
+            self._node_triggered,
+            self._node_active,
+        )
+
+    def snapshot_dynamics(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns copies of the node x positions, the node active states, the
+        angular velocities, and the gravity of every double pendulum, taken
+        together so that they are consistent even while another thread
+        resizes the system.
+        """
+        with self._resize_lock:
+            return (
+                self._node_last_x.copy(),
+                self._node_active.copy(),
+                self._angular_velocity.copy(),
+                self._g.copy(),
+            )
 
     def update_gravity(self, g: float) -> None:
         """
@@ -244,11 +636,8 @@ class PendulumSystem:
         # Scale factor for angular velocity
         gravity_ratio = math.sqrt(g / self.g)
 
-        for double_pendulum in self.double_pendulums:
-            double_pendulum.g = g
-            for pendulum in double_pendulum.pendulums:
-                # Scale angular velocity
-                pendulum.angular_velocity *= gravity_ratio
+        self._g[:] = g
+        self._angular_velocity *= gravity_ratio
 
         self.g = g
 
@@ -256,27 +645,52 @@ class PendulumSystem:
         """
         Updates the number of double pendulum systems.
         """
-        if n < len(self.double_pendulums):
-            self.double_pendulums = self.double_pendulums[:n]
-        elif n > len(self.double_pendulums):
-            missing_pendulums = n - len(self.double_pendulums)
-            for _ in range(missing_pendulums):
-                double_pendulum = DoublePendulum(
-                    g=self.g,
-                    temperature=self.temperature,
-                    mass_range=self.mass_range,
-                    length_range=self.length_range,
-                    angle_range=self.angle_range,
-                )
-                self.double_pendulums.append(double_pendulum)
+        if n == len(self.double_pendulums):
+            return
+
+        with self._resize_lock:
+            if n < len(self.double_pendulums):
+                for double_pendulum in self.double_pendulums[n:]:
+                    for node_idx, pendulum in enumerate(
+                        double_pendulum.pendulums
+                    ):
+                        node = pendulum.node
+                        if node.prev_pitch is not None:
+                            self._released_notes.append(
+                                (node_idx, node.prev_pitch)
+                            )
+                            node.prev_pitch = None
+                self.double_pendulums = self.double_pendulums[:n]
+            else:
+                self.double_pendulums = self.double_pendulums + [
+                    DoublePendulum(
+                        g=self.g,
+                        temperature=self.temperature,
+                        mass_range=self.mass_range,
+                        length_range=self.length_range,
+                        angle_range=self.angle_range,
+                    )
+                    for _ in range(n - len(self.double_pendulums))
+                ]
+            self._pack()
+
+    def pop_released_notes(self) -> list[tuple[int, int]]:
+        """
+        Returns the (node index, pitch) of the notes still sounding on double
+        pendulums removed from the system since the last call, and forgets
+        them.
+        """
+        with self._resize_lock:
+            released, self._released_notes = self._released_notes, []
+        return released
 
     def update_mass_range(self, mass_range: float) -> None:
         """
         Updates the mass range for all of the double pendulums in the system.
         """
-        for double_pendulum in self.double_pendulums:
-            for pendulum in double_pendulum.pendulums:
-                pendulum.mass = random.uniform(1 - mass_range, 1 + mass_range)
+        self._mass[...] = self._rng.uniform(
+            1 - mass_range, 1 + mass_range, self._mass.shape
+        )
 
         self.mass_range = mass_range
 
@@ -284,11 +698,9 @@ class PendulumSystem:
         """
         Updates the length range for all of the double pendulums in the system.
         """
-        for double_pendulum in self.double_pendulums:
-            for pendulum in double_pendulum.pendulums:
-                pendulum.length = random.uniform(
-                    1 - length_range, 1 + length_range
-                )
+        self._length[...] = self._rng.uniform(
+            1 - length_range, 1 + length_range, self._length.shape
+        )
 
         self.length_range = length_range
 
@@ -297,24 +709,22 @@ class PendulumSystem:
         Updates the temperature_factor of the double pendulums and scales angular velocity.
         """
 
-        for double_pendulum in self.double_pendulums:
-            # Calculate the new temperature factor
-            new_temperature_factor = (
-                double_pendulum.calculate_temperature_factor(temperature)
-            )
+        # Calculate the new temperature factor
+        new_temperature_factor = DoublePendulum.calculate_temperature_factor(
+            temperature
+        )
 
-            # Scale angular velocity based on the ratio of the new and old temperature factors
-            factor_ratio = (
-                new_temperature_factor / double_pendulum.temperature_factor
-            )
-            for pendulum in double_pendulum.pendulums:
-                pendulum.angular_velocity *= factor_ratio
+        # Scale angular velocity based on the ratio of the new and old temperature factors
+        factor_ratio = new_temperature_factor / self._temperature_factor
+        self._angular_velocity *= factor_ratio[:, np.newaxis]
 
-                # Clamp the angular velocity to prevent excessive spinning
-                pendulum.angular_velocity = max(
-                    -MAX_ANGULAR_VELOCITY,
-                    min(pendulum.angular_velocity, MAX_ANGULAR_VELOCITY),
-                )
+        # Clamp the angular velocity to prevent excessive spinning
+        np.clip(
+            self._angular_velocity,
+            -MAX_ANGULAR_VELOCITY,
+            MAX_ANGULAR_VELOCITY,
+            out=self._angular_velocity,
+        )
 
-            # Update the temperature factor
-            double_pendulum.temperature_factor = new_temperature_factor
+        # Update the temperature factor
+        self._temperature_factor[:] = new_temperature_factor
@@ -1,4 +1,7 @@
+import functools
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import numpy as np
 import sounddevice as sd
@@ -8,6 +11,17 @@ from Config import Config
 from EventManager import Event, EventType, event_manager
 from PendulumSystem import PendulumSystem
 
+# Decode on the GPU when one is available
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+if DEVICE.type == "cuda":
+    # The latent shape only changes with the number of pendulums, so let
+    # cuDNN pick the fastest convolutions for it, and allow TF32 tensor cores
+    # for the decoder's float32 convolutions and matrix products
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.set_float32_matmul_precision("high")
+
 
 class RAVESonifier:
     """
@@ -20,6 +34,12 @@ class RAVESonifier:
     sounddevice.
     """
 
+    # RAVE settings for each weights file, and the weights file for each
+    # weather condition, loaded lazily from the mapping files the first time
+    # the settings are updated.
+    _RAVE_WEIGHTS_MAP: dict = None
+    _WEATHER_WEIGHTS_MAP: dict = None
+
     def __init__(
         self,
         pendulum_system: PendulumSystem,
@@ -49,11 +69,26 @@ class RAVESonifier:
             self.weights_path = weights_path
             self.latent_dim = latent_dim
 
-        self.load_model()
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
         self.scaling_factor = scaling_factor
         self.pendulum_system = pendulum_system
+        self._rng = np.random.default_rng()
+        # Flat latent buffer reused across audio callbacks
+        self._latent_buffer = np.empty(0, dtype=np.float32)
+
+        # Held by the audio callback while it decodes, and while a newly
+        # loaded model and its settings are swapped in
+        self._model_lock = threading.Lock()
+        # Models for new settings are loaded one at a time, in order, off the
+        # thread that published the event
+        self._model_loader = ThreadPoolExecutor(max_workers=1)
+        # Set by close, after which settings changes no longer load models
+        self._closed = False
+        # Set by stop_audio to end the streaming loop
+        self._stop_streaming = threading.Event()
+
+        self.load_model()
 
         self._register_event_handlers()
 
@@ -67,68 +102,266 @@ class RAVESonifier:
         event_manager.subscribe(
             EventType.WEATHER_UPDATED, self._on_weather_changed
         )
+        event_manager.subscribe(
+            EventType.PENDULUM_COUNT_CHANGED, self._on_pendulum_count_changed
+        )
+
+    def close(self):
+        """
+        Stop reacting to events and wait for any model still loading in the
+        background.
+        """
+        self._closed = True
+        event_manager.unsubscribe(
+            EventType.MOON_MODE_CHANGED, self._on_moon_mode_changed
+        )
+        event_manager.unsubscribe(
+            EventType.WEATHER_UPDATED, self._on_weather_changed
+        )
+        event_manager.unsubscribe(
+            EventType.PENDULUM_COUNT_CHANGED, self._on_pendulum_count_changed
+        )
+        self._model_loader.shutdown(wait=True)
 
     def _on_weather_changed(self, event: Event):
         """
         Update the weather condition and settings based on the given event data.
         """
-        self.update_settings()
-        self.load_model()
+        self._reload_model()
         self.weather_condition = event.data
 
     def _on_moon_mode_changed(self, event: Event):
         """
         Update the moon mode and settings based on the given event data.
         """
-        self.update_settings()
-        self.load_model()
+        self._reload_model()
         self.moon_mode = event.data
 
+    def _on_pendulum_count_changed(self, event: Event):
+        """
+        Prepare the current model in the background for the latent shape of
+        the new number of pendulums. Until then, latents of the new shape are
+        decoded without the captured graph.
+        """
+        if self._closed:
+            return
+
+        future = self._model_loader.submit(self._recapture_graph, event.data)
+        future.add_done_callback(
+            functools.partial(self._report_load_error, self.weights_path)
+        )
+
+    def _recapture_graph(self, num_double_pendulums: int):
+        """
+        Warm up the current model and capture its decode graph again for the
+        given number of double pendulums.
+        """
+        with self._model_lock:
+            model, latent_dim = self.model, self.latent_dim
+        self._warm_up(
+            model, latent_dim, num_double_pendulums=num_double_pendulums
+        )
+        decode_graph = self._capture_graph(
+            model, latent_dim, num_double_pendulums
+        )
+        with self._model_lock:
+            # A model swapped in meanwhile comes with its own graph
+            if self.model is model:
+                self._decode_graph = decode_graph
+
+    def _reload_model(self):
+        """
+        Resolve the settings for the current weather condition and moon mode,
+        and load the matching model in the background. The current model
+        keeps playing until the new one is ready.
+        """
+        if self._closed:
+            return
+
+        weights_path, latent_dim, volume = self._resolve_settings()
+        self.weights_path = weights_path
+        future = self._model_loader.submit(
+            self._swap_model, weights_path, latent_dim, volume
+        )
+        future.add_done_callback(
+            functools.partial(self._report_load_error, weights_path)
+        )
+
+    @staticmethod
+    def _report_load_error(weights_path: str, future: Future):
+        """
+        Report a model that failed to load in the background. The previous
+        model keeps playing.
+        """
+        error = future.exception()
+        if error is not None:
+            print(f"Error loading RAVE model {weights_path}: {error}")
+
+    def _swap_model(self, weights_path: str, latent_dim: int, volume: float):
+        """
+        Load and prepare the model with the given settings, then switch the
+        audio callback over to it together with its settings.
+        """
+        model, decode_graph = self._prepare_model(weights_path, latent_dim)
+        with self._model_lock:
+            self.latent_dim, self.volume = latent_dim, volume
+            self.model, self._decode_graph = model, decode_graph
+
     def load_model(self):
         """
         Load the pre-trained torch model with the weights specified in the
-        configuration files.
+        configuration files. The model is warmed up before it replaces the
+        current one, so the audio callback never pays for the first, slow
+        TorchScript runs.
+        """
+        model, decode_graph = self._prepare_model(
+            self.weights_path, self.latent_dim
+        )
+        with self._model_lock:
+            self.model, self._decode_graph = model, decode_graph
+
+    def _prepare_model(self, weights_path: str, latent_dim: int) -> tuple[
+        torch.jit.ScriptModule,
+        tuple[
+            torch.cuda.CUDAGraph,
+            torch.Tensor,
+            torch.Tensor,
+            torch.jit.ScriptModule,
+        ]
+        | None,
+    ]:
         """
-        self.model = torch.jit.load(self.weights_path)
-        self.model.eval()
+        Load the model with the given weights and warm it up for latents of
+        the given dimension, capturing its decode as a CUDA graph when
+        possible.
+        """
+        model = torch.jit.load(weights_path, map_location=DEVICE)
+        model.eval()
+        self._warm_up(model, latent_dim)
+        return model, self._capture_graph(model, latent_dim)
+
+    def _latent_shape(
+        self, latent_dim: int, num_double_pendulums: int = None
+    ) -> tuple[int, int, int]:
+        """
+        Shape of the latents generated from the given number of double
+        pendulums, by default the number currently in the pendulum system.
+        """
+        if num_double_pendulums is None:
+            num_double_pendulums = len(self.pendulum_system.double_pendulums)
+        num_values = 4 * num_double_pendulums
+        return 1, latent_dim, max(1, -(-num_values // latent_dim))
+
+    def _warm_up(
+        self,
+        model: torch.jit.ScriptModule,
+        latent_dim: int,
+        runs: int = 2,
+        num_double_pendulums: int = None,
+    ):
+        """
+        Decode silent latents shaped like the ones generated from the pendulum
+        system, letting TorchScript profile and optimize the decoder ahead of
+        streaming.
+        """
+        latents = torch.zeros(
+            self._latent_shape(latent_dim, num_double_pendulums),
+            device=DEVICE,
+        )
+        with torch.inference_mode():
+            for _ in range(runs):
+                model.decode(latents)
+
+    def _capture_graph(
+        self,
+        model: torch.jit.ScriptModule,
+        latent_dim: int,
+        num_double_pendulums: int = None,
+    ) -> (
+        tuple[
+            torch.cuda.CUDAGraph,
+            torch.Tensor,
+            torch.Tensor,
+            torch.jit.ScriptModule,
+        ]
+        | None
+    ):
+        """
+        Capture one decode of the warmed-up model as a CUDA graph, so each
+        audio callback replays the whole decoder with a single launch. Returns
+        the graph with its static input and output tensors and the model
+        itself, which keeps the captured weights alive while a callback may
+        still be replaying the graph, or None when not decoding on CUDA or
+        when the model cannot be captured.
+        """
+        if DEVICE.type != "cuda":
+            return None
+
+        static_latents = torch.zeros(
+            self._latent_shape(latent_dim, num_double_pendulums),
+            device=DEVICE,
+        )
+        graph = torch.cuda.CUDAGraph()
+        # Capturing forbids CUDA work on every other thread, and the audio
+        # thread only decodes while holding the model lock
+        with self._model_lock:
+            try:
+                with torch.no_grad(), torch.cuda.graph(graph):
+                    static_audio = model.decode(static_latents)
+            except RuntimeError:
+                return None
+        return graph, static_latents, static_audio, model
 
     def update_settings(self):
         """
         Update the settings based on the current weather condition and moon
         mode.
         """
-        with open("rave_weights_mapping.json") as f:
-            rave_weights_mapping = json.load(f)
+        self.weights_path, self.latent_dim, self.volume = (
+            self._resolve_settings()
+        )
 
-        with open("weather_music_mapping.json") as f:
-            weather_music_mapping = json.load(f)
+    def _resolve_settings(self) -> tuple[str, int, float]:
+        """
+        Look up the weights path, latent dimension, and volume for the current
+        weather condition and moon mode.
+        """
+        if type(self)._RAVE_WEIGHTS_MAP is None:
+            type(self)._RAVE_WEIGHTS_MAP, type(self)._WEATHER_WEIGHTS_MAP = (
+                self._load_mappings()
+            )
 
         if Config.moon_mode:
             weights_path = "rave_model_weights/moon.ts"
         else:
-            weights_path = weather_music_mapping[Config.weather_condition][
-                "weights"
+            weights_path = type(self)._WEATHER_WEIGHTS_MAP[
+                Config.weather_condition
             ]
 
-        with open("rave_weights_mapping.json") as f:
-            rave_weights_mapping = json.load(f)
-            rave_settings = rave_weights_mapping[weights_path]
-            self.weights_path = weights_path
-            self.latent_dim = rave_settings["latent_dim"]
-            self.volume = rave_settings["volume"]
+        rave_settings = type(self)._RAVE_WEIGHTS_MAP[weights_path]
+        return (
+            weights_path,
+            rave_settings["latent_dim"],
+            rave_settings["volume"],
+        )
 
-    def _fill_latent_column_with_random_values(
-        self, latent_column: list
-    ) -> list:
+    @staticmethod
+    def _load_mappings() -> tuple[dict, dict]:
         """
-        Fill a latent column with random values if it is not the correct
-        length.
+        Load the RAVE weights mapping file and the weights path for each
+        weather condition from the weather music mapping file.
         """
-        missing_latents = self.latent_dim - len(latent_column)
-        latent_column += [
-            torch.randn(1).item() for _ in range(missing_latents)
-        ]
-        return latent_column
+        with open("rave_weights_mapping.json") as f:
+            rave_weights_mapping = json.load(f)
+
+        with open("weather_music_mapping.json") as f:
+            weather_music_mapping = json.load(f)
+
+        weather_weights = {
+            condition: settings["weights"]
+            for condition, settings in weather_music_mapping.items()
+        }
+        return rave_weights_mapping, weather_weights
 
     def generate_latents(self) -> torch.Tensor:
         """
@@ -140,82 +373,99 @@ class RAVESonifier:
         """
         # Add noise to the latent vectors to make the audio less static
         noise_factor = 0.5
-        latents = []
-        for double_pendulum in self.pendulum_system.double_pendulums:
-            for pendulum in double_pendulum.pendulums:
-                x_latent = (
-                    pendulum.node.last_x - self.scaling_factor
-                ) / self.scaling_factor
-                x_latent = (
-                    x_latent * (1 - noise_factor)
-                    + torch.randn(1).item() * noise_factor
-                )
-                latents.append(x_latent)
-
-                av_latent = pendulum.angular_velocity / double_pendulum.g
-                av_latent = (
-                    av_latent * (1 - noise_factor)
-                    + torch.randn(1).item() * noise_factor
-                )
-                latents.append(av_latent)
-
-        # Fill the latent vectors with random values if there aren't enough
-        if len(latents) < self.latent_dim:
-            latents += [
-                torch.randn(1).item()
-                for _ in range(self.latent_dim - len(latents))
-            ]
 
-        columns = -(-len(latents) // self.latent_dim)
-        latent_columns = []
-        for i in range(columns):
-            start = i * self.latent_dim
-            end = start + self.latent_dim
-            latent_column = latents[start:end]
-            if len(latent_column) < self.latent_dim:
-                latent_column = self._fill_latent_column_with_random_values(
-                    latent_column
-                )
-            latent_columns.append(latent_column)
+        # Positions are centred on the origin and normalized, angular
+        # velocities are scaled by gravity. Nodes that have not been placed on
+        # screen yet (NaN) are treated as being at the origin. The state is
+        # read through a snapshot, as the system may be resized meanwhile.
+        last_x, _, angular_velocity, g = (
+            self.pendulum_system.snapshot_dynamics()
+        )
+        values = np.empty((len(last_x), 2, 2))
+        positions = values[:, :, 0]
+        np.subtract(last_x, self.scaling_factor, out=positions)
+        positions /= self.scaling_factor
+        np.copyto(positions, 0.0, where=np.isnan(positions))
+        np.divide(angular_velocity, g[:, np.newaxis], out=values[:, :, 1])
 
-        return torch.tensor(latent_columns).view(1, self.latent_dim, columns)
+        # Each pendulum contributes its position and angular velocity in turn
+        values = values.ravel()
+
+        # Draw all the noise at once into the reused latent buffer. Latents
+        # not driven by a pendulum are left as pure noise, up to a whole
+        # number of columns.
+        num_values = len(values)
+        columns = max(1, -(-num_values // self.latent_dim))
+        if self._latent_buffer.size != columns * self.latent_dim:
+            self._latent_buffer = np.empty(
+                columns * self.latent_dim, dtype=np.float32
+            )
+        latents = self._rng.standard_normal(
+            dtype=np.float32, out=self._latent_buffer
+        )
+        latents[:num_values] = (
+            values * (1 - noise_factor) + latents[:num_values] * noise_factor
+        )
+
+        return torch.from_numpy(latents).view(1, self.latent_dim, columns)
 
     def generate_audio(self, latents: torch.Tensor) -> np.ndarray:
         """
         Generate audio from the latent vectors. The latent vectors are decoded
         into audio using the pre-trained torch model.
         """
-        with torch.no_grad():
-            return self.model.decode(latents).numpy().flatten()
+        decode_graph = self._decode_graph
+        if decode_graph is not None and latents.shape == decode_graph[1].shape:
+            graph, static_latents, audio, _ = decode_graph
+            static_latents.copy_(latents)
+            graph.replay()
+        else:
+            with torch.inference_mode():
+                audio = self.model.decode(latents.to(DEVICE))
+        # Flatten without copying, the callback scales straight out of it
+        return audio.cpu().numpy().reshape(-1)
 
     def stream_audio(self) -> None:
         """
-        Stream audio generated from the pendulum system in real time.
+        Stream audio generated from the pendulum system in real time until
+        stop_audio is called. Blocks the calling thread, decoding one buffer
+        at a time and writing it to the stream. Writes wait inside PortAudio
+        for room in the output buffer, so PortAudio's own audio thread never
+        runs Python or waits for the GIL.
         """
-
-        def callback(outdata, frames, time, status):
-            """
-            Callback function for the sounddevice stream.
-            """
-            latents = self.generate_latents()
-            audio = self.generate_audio(latents)
-            audio *= self.volume
-            outdata[:] = np.expand_dims(audio[:frames], axis=1)
-
         self.stream = sd.OutputStream(
             samplerate=self.sample_rate,
             blocksize=self.buffer_size,
             channels=1,
-            callback=callback,
+            dtype="float32",
+            latency="high",
         )
+        block = np.empty((self.buffer_size, 1), dtype=np.float32)
         self.stream.start()
         print("Streaming audio...")
 
+        # Only this thread touches the stream, so it is never aborted while
+        # closing or closed while written to
+        try:
+            while not self._stop_streaming.is_set():
+                with self._model_lock:
+                    latents = self.generate_latents()
+                    audio = self.generate_audio(latents)
+                    # Scale straight into the output block
+                    np.multiply(
+                        audio[: self.buffer_size], self.volume, out=block[:, 0]
+                    )
+                self.stream.write(block)
+            # Drop the audio still buffered instead of playing it out
+            self.stream.abort()
+        finally:
+            self.stream.close()
+            print("Audio streaming stopped.")
+
     def stop_audio(self) -> None:
         """
-        Stop the audio stream.
+        Stop the audio stream. The streaming thread stops once its pending
+        write returns, within one buffer, and discards the audio still
+        buffered.
         """
-        if hasattr(self, "stream"):
-            self.stream.stop()
-            self.stream.close()
-            print("Audio streaming stopped.")
+        self._stop_streaming.set()
@@ -12,6 +12,24 @@ class Sidebar:
     weather location.
     """
 
+    THEME = {
+        "button": {
+            "font": {
+                "name": "Courier New",
+                "size": 16,
+            }
+        },
+        "text_entry_line": {
+            "font": {
+                "name": "Courier New",
+                "size": 16,
+            }
+        },
+    }
+
+    # Label font, created lazily once pygame's font module is initialized
+    _FONT: pygame.font.Font = None
+
     def __init__(self, x: int, y: int, width: int, height: int):
         """
         Initializes the sidebar with the given position, width, and height.
@@ -25,24 +43,19 @@ class Sidebar:
         self.width = width
         self.height = height
         self.manager = pygame_gui.UIManager((self.width, self.height))
-        self.manager.ui_theme.load_theme(
-            {
-                "button": {
-                    "font": {
-                        "name": "Courier New",
-                        "size": 16,
-                    }
-                },
-                "text_entry_line": {
-                    "font": {
-                        "name": "Courier New",
-                        "size": 16,
-                    }
-                },
-            }
-        )
+        self.manager.ui_theme.load_theme(self.THEME)
         self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.font = pygame.font.SysFont("Courier New", 16)
+
+        # Looking up a system font scans the installed fonts, so it is only
+        # done for the first sidebar
+        if type(self)._FONT is None:
+            type(self)._FONT = pygame.font.SysFont("Courier New", 16)
+        self.font = type(self)._FONT
+        # Rendered label for each label position, as (text, surface), so a
+        # label is only rendered again when its text changes
+        self._label_surfaces: dict[
+            tuple[int, int], tuple[str, pygame.Surface]
+        ] = {}
 
         self.moon_checkbox = pygame_gui.elements.UIButton(
             relative_rect=pygame.Rect((20, 20), (self.width - 40, 30)),
@@ -109,26 +122,27 @@ class Sidebar:
 
         if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
             if event.ui_element == self.mass_slider:
-                if self.mass_range != Config.mass_range:
-                    Config.mass_range = self.mass_range
+                mass_range = self.mass_range
+                if mass_range != Config.mass_range:
+                    Config.mass_range = mass_range
                     event_manager.publish(
-                        Event(EventType.MASS_RANGE_CHANGED, Config.mass_range)
+                        Event(EventType.MASS_RANGE_CHANGED, mass_range)
                     )
             elif event.ui_element == self.length_slider:
-                if self.length_range != Config.length_range:
-                    Config.length_range = self.length_range
+                length_range = self.length_range
+                if length_range != Config.length_range:
+                    Config.length_range = length_range
                     event_manager.publish(
-                        Event(
-                            EventType.LENGTH_RANGE_CHANGED, Config.length_range
-                        )
+                        Event(EventType.LENGTH_RANGE_CHANGED, length_range)
                     )
             elif event.ui_element == self.n_double_pendulums:
-                if self.num_double_pendulums != Config.num_double_pendulums:
-                    Config.num_double_pendulums = self.num_double_pendulums
+                num_double_pendulums = self.num_double_pendulums
+                if num_double_pendulums != Config.num_double_pendulums:
+                    Config.num_double_pendulums = num_double_pendulums
                     event_manager.publish(
                         Event(
                             EventType.PENDULUM_COUNT_CHANGED,
-                            Config.num_double_pendulums,
+                            num_double_pendulums,
                         )
                     )
 
@@ -161,24 +175,36 @@ class Sidebar:
         """
         Renders the current values of the sliders on the given surface.
         """
-        location_text = "Location:"
-        num_pendulums_text = f"Double Pendulums: {self.num_double_pendulums}"
-        length_text = f"Length Range: {self.length_range:.2f}"
-        mass_text = f"Mass Range: {self.mass_range:.2f}"
-
-        location_surface = self.font.render(
-            location_text, False, (255, 255, 255)
+        self._blit_label(surface, "Location:", (20, 50))
+        self._blit_label(
+            surface,
+            f"Double Pendulums: {self.num_double_pendulums}",
+            (20, 100),
         )
-        num_pendulums_surface = self.font.render(
-            num_pendulums_text, False, (255, 255, 255)
+        self._blit_label(
+            surface, f"Length Range: {self.length_range:.2f}", (20, 150)
+        )
+        self._blit_label(
+            surface, f"Mass Range: {self.mass_range:.2f}", (20, 200)
         )
-        length_surface = self.font.render(length_text, False, (255, 255, 255))
-        mass_surface = self.font.render(mass_text, False, (255, 255, 255))
 
-        surface.blit(location_surface, (20, 50))
-        surface.blit(num_pendulums_surface, (20, 100))
-        surface.blit(length_surface, (20, 150))
-        surface.blit(mass_surface, (20, 200))
+    def _blit_label(
+        self, surface: pygame.Surface, text: str, position: tuple[int, int]
+    ) -> None:
+        """
+        Blits the given label text at the given position, rendering it only
+        if it differs from the text last shown there.
+        """
+        cached = self._label_surfaces.get(position)
+        if cached is None or cached[0] != text:
+            # Converted to the display's pixel format so blits need no
+            # conversion
+            label_surface = self.font.render(
+                text, False, (255, 255, 255)
+            ).convert()
+            cached = (text, label_surface)
+            self._label_surfaces[position] = cached
+        surface.blit(cached[1], position)
 
     @property
     def moon_mode(self) -> bool:
@@ -1,11 +1,9 @@
-import math
-import random
-
+import numpy as np
 import pygame
 
 from Config import Config
 from EventManager import Event, EventType, event_manager
-from PendulumSystem import DoublePendulum, Node, Pendulum, PendulumSystem
+from PendulumSystem import PendulumSystem
 from Sidebar import Sidebar
 
 
@@ -32,7 +30,7 @@ class PendulumSystemVisualizer:
         pygame.init()
         self.sidebar_width = 250
         self.size = size[0] + self.sidebar_width, size[1]
-        self.screen = pygame.display.set_mode(self.size)
+        self.screen = pygame.display.set_mode(self.size, pygame.DOUBLEBUF)
         pygame.display.set_caption("Weathered Chaos")
         pygame.font.init()
         self.font = pygame.font.SysFont("Courier New", 20)
@@ -46,12 +44,19 @@ class PendulumSystemVisualizer:
             (self.width + self.sidebar_width) // 2,
             self.height // 3,
         )
-        self.pendulum_colors = [
-            self._random_color() for _ in range(self.num_pendulums)
-        ]
+        self._rng = np.random.default_rng()
+        self.pendulum_colors = self._random_colors(self.num_pendulums)
         self.background_color = self.get_background_color()
         self.clock = pygame.time.Clock()
         self.node_threshold = 5
+        # Screen coordinates of each double pendulum for the current frame
+        self._frame_coords: list[list[list[float]]] = []
+
+        # Rendered text for each text position, as ((text, color), surface),
+        # so a text is only rendered again when it changes
+        self._text_surfaces: dict[
+            tuple[int, int], tuple[tuple[str, tuple], pygame.Surface]
+        ] = {}
 
         self.location_weather_text = ""
         self.gravity_text = ""
@@ -113,10 +118,9 @@ class PendulumSystemVisualizer:
         self.pendulum_system.update_number_of_pendulums(current_n_pendulums)
         self.num_pendulums = current_n_pendulums
         if current_n_pendulums > len(self.pendulum_colors):
-            self.pendulum_colors += [
-                self._random_color()
-                for _ in range(current_n_pendulums - len(self.pendulum_colors))
-            ]
+            self.pendulum_colors += self._random_colors(
+                current_n_pendulums - len(self.pendulum_colors)
+            )
 
     def _on_mass_range_changed(self, event: Event):
         """
@@ -152,73 +156,22 @@ class PendulumSystemVisualizer:
 
         return True
 
-    def _random_color(self):
-        """
-        Generates a random RGB color for each pendulum system.
-        """
-        return (
-            random.randint(100, 255),
-            random.randint(100, 255),
-            random.randint(100, 255),
-        )
-
-    def _convert_to_screen_coords(self, pendulum: DoublePendulum):
+    def _random_colors(self, n: int) -> list[tuple[int, int, int]]:
         """
-        Converts a single double pendulum's angles to screen coordinates.
+        Generates n random RGB colors, one for each pendulum system.
         """
-        coords = [self.origin]
-        x, y = self.origin
-        for p in pendulum.pendulums:
-            x += p.length * self.scale * math.sin(p.angle)
-            y += p.length * self.scale * math.cos(p.angle)
-            coords.append((x, y))
-        return coords
+        return list(map(tuple, self._rng.integers(100, 256, (n, 3)).tolist()))
 
-    def _update_node_states(self, double_pendulum: DoublePendulum):
+    def _draw_double_pendulum(self, color, coords: list, radii: list):
         """
-        Updates the state of each node in the double pendulum. If a node
-        crosses the origin, it becomes active and triggers the node. If
-        the node moves far enough away from the origin, the node is no longer
-        triggered.
+        Draws a double pendulum from its screen coordinates. The nodes are
+        drawn as circles with the given radii and the pendulum links are
+        drawn as lines.
         """
-        origin_x, _ = self.origin
-        coords = self._convert_to_screen_coords(double_pendulum)
-        # Skip the fixed origin (index 0)
-        for idx, (x, _) in enumerate(coords[1:]):
-            p: Pendulum = double_pendulum.pendulums[idx]
-            node: Node = p.node
-
-            if node.last_x is not None:
-                previous_side = node.last_x < origin_x
-                current_side = x < origin_x
-
-                if previous_side != current_side:
-                    if not node.triggered:
-                        node.active = True
-                        node.triggered = True
-                else:
-                    node.active = False
-
-                # Reset lock if the node moves sufficiently away from the origin.
-                if abs(x - origin_x) > self.node_threshold * 2:
-                    node.triggered = False
-
-            node.last_x = x
-
-    def _draw_double_pendulum(self, double_pendulum: DoublePendulum, color):
-        """
-        Draws a double pendulum. The nodes are drawn as circles and the
-        pendulum links are drawn as lines.
-        """
-        coords = self._convert_to_screen_coords(double_pendulum)
-        for i, (start, end) in enumerate(zip(coords, coords[1:])):
-            pygame.draw.line(self.screen, color, start, end, 3)
-            pendulum = double_pendulum.pendulums[i]
+        pygame.draw.lines(self.screen, color, False, coords, 3)
+        for radius, end in zip(radii, coords[1:]):
             pygame.draw.circle(
-                self.screen,
-                color,
-                (int(end[0]), int(end[1])),
-                self.scale / 25 * pendulum.mass,
+                self.screen, color, (int(end[0]), int(end[1])), radius
             )
 
     def update_location_weather_text(self):
@@ -253,10 +206,17 @@ class PendulumSystemVisualizer:
 
     def render_text(self, text, position, color=(255, 255, 255)):
         """
-        Renders text on the screen at the given position.
+        Renders text on the screen at the given position. The text is only
+        rasterized again if it differs from the text last shown there.
         """
-        text_surface = self.font.render(text, False, color)
-        self.screen.blit(text_surface, position)
+        cached = self._text_surfaces.get(position)
+        if cached is None or cached[0] != (text, color):
+            # Converted to the display's pixel format so blits need no
+            # conversion
+            text_surface = self.font.render(text, False, color).convert()
+            cached = ((text, color), text_surface)
+            self._text_surfaces[position] = cached
+        self.screen.blit(cached[1], position)
 
     def draw_texts(self):
         """
@@ -277,10 +237,19 @@ class PendulumSystemVisualizer:
         """
         Draws all double pendulums in the system.
         """
-        for color, double_pendulum in zip(
-            self.pendulum_colors, pendulum_system.double_pendulums
+        coords = self._frame_coords
+        if len(coords) != len(pendulum_system.double_pendulums):
+            # Not updated since the system was created or resized
+            coords = pendulum_system.screen_coords(
+                self.origin, self.scale
+            ).tolist()
+        # Node radii follow the masses, computed for all nodes at once
+        radii = (self.scale / 25 * pendulum_system.masses).tolist()
+
+        for color, dp_coords, dp_radii in zip(
+            self.pendulum_colors, coords, radii
         ):
-            self._draw_double_pendulum(double_pendulum, color)
+            self._draw_double_pendulum(color, dp_coords, dp_radii)
 
         self.sidebar.draw(self.screen, self.background_color)
         self.draw_texts()
@@ -290,8 +259,13 @@ class PendulumSystemVisualizer:
         Updates node information for each double pendulum in the system and
         updates the sidebar.
         """
-        for double_pendulum in pendulum_system.double_pendulums:
-            self._update_node_states(double_pendulum)
+        # Screen coordinates are computed once per frame for the whole system,
+        # used to update every node at once, and reused by draw
+        coords = pendulum_system.screen_coords(self.origin, self.scale)
+        pendulum_system.update_nodes(
+            coords, self.origin[0], self.node_threshold
+        )
+        self._frame_coords = coords.tolist()
 
         self.sidebar.update(time_delta)
 
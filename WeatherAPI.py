@@ -1,8 +1,17 @@
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
 from Config import Config
 from EventManager import Event, EventType, event_manager
 
+# Seconds to wait for the weather service before giving up
+REQUEST_TIMEOUT = 5
+# Seconds for which fetched weather data is reused for the same location
+CACHE_TTL = 300
+
 
 class WeatherAPI:
     def __init__(self, api_key: str, location: str = "Barcelona"):
@@ -18,6 +27,16 @@ class WeatherAPI:
         self.base_url = "http://api.weatherapi.com/v1"
         self.temperature = None
         self.weather_condition = None
+        # Reuses the connection to the weather service across requests
+        self._session = requests.Session()
+        # Location -> (time fetched, weather data) of the last good response
+        self._cache: dict[str, tuple[float, dict]] = {}
+        # Runs location changes off the thread that published them, so the
+        # request does not stall the main loop
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Location of the latest location change, so that results of older
+        # requests still in flight are not applied over it
+        self._requested_location = location
 
         self._register_event_handlers()
 
@@ -28,13 +47,33 @@ class WeatherAPI:
 
     def _on_location_changed(self, event: Event):
         """
-        Event handler for location change event. Tries to fetch weather data
-        for the new location. If the request fails, reverts to the old location.
+        Event handler for location change event. Fetches the weather for the
+        new location in the background, see _change_location.
         """
-        new_location = event.data
-        old_location = self.location
-        self.location = new_location
-        weather_data = self.fetch_current_weather_data()
+        self._requested_location = event.data
+        self._executor.submit(self._change_location, event.data)
+
+    def _change_location(self, new_location: str):
+        """
+        Fetches weather data for the new location. Runs on a worker thread,
+        so the result is handed to _apply_location_change to be applied on
+        the main thread.
+        """
+        weather_data = self._request_weather_data(new_location)
+        event_manager.post_call(
+            functools.partial(
+                self._apply_location_change, new_location, weather_data
+            )
+        )
+
+    def _apply_location_change(self, new_location: str, weather_data: dict):
+        """
+        Switches to the new location and applies its weather data. If the
+        request failed, keeps the old location. Ignored if another location
+        has been requested since.
+        """
+        if new_location != self._requested_location:
+            return
 
         if not weather_data:
             event_manager.publish(
@@ -46,21 +85,48 @@ class WeatherAPI:
                     },
                 )
             )
-            self.location = old_location
-            Config.location = old_location
+            Config.location = self.location
 
             return
 
+        self.location = new_location
+        self._apply_weather_data(weather_data)
+
     def fetch_current_weather_data(self) -> dict:
-        """Fetch current weather data from API"""
+        """
+        Fetch current weather data from API, or reuse the data fetched for
+        the same location within the last CACHE_TTL seconds.
+        """
+        data = self._request_weather_data(self.location)
+        if not data:
+            self.temperature = Config.temperature
+            self.weather_condition = Config.weather_condition
+            return {}
+
+        self._apply_weather_data(data)
+        return data
+
+    def _request_weather_data(self, location: str) -> dict:
+        """
+        Request the current weather data for the given location, or reuse
+        the data cached for it. Returns an empty dict if the request fails.
+        Only touches the cache, so it is safe to call from a worker thread.
+        """
         params = {
-            "q": self.location,
+            "q": location,
             "key": self.api_key,
         }
         current_weather_endpoint = "/current.json"
         try:
+            now = time.monotonic()
+            cached = self._cache.get(location)
+            if cached is not None and now - cached[0] < CACHE_TTL:
+                return cached[1]
+
             url = f"{self.base_url}{current_weather_endpoint}"
-            response = requests.get(url, params=params)
+            response = self._session.get(
+                url, params=params, timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()
             data = response.json()
             if (
@@ -69,27 +135,29 @@ class WeatherAPI:
                 or "text" not in data["current"]["condition"]
             ):
                 raise ValueError("Incomplete current weather data found")
-
-            self.temperature = data["current"]["temp_c"]
-            self.weather_condition = data["current"]["condition"]["text"]
-
-            Config.weather_condition = self.weather_condition
-            Config.temperature = self.temperature
-
-            event_manager.publish(
-                Event(
-                    EventType.WEATHER_UPDATED,
-                    {
-                        "condition": self.weather_condition,
-                        "temperature": self.temperature,
-                    },
-                )
-            )
-
+            self._cache[location] = (now, data)
             return data
 
         except (ValueError, requests.exceptions.RequestException) as e:
             print(f"Error fetching weather data: {e}")
-            self.temperature = Config.temperature
-            self.weather_condition = Config.weather_condition
             return {}
+
+    def _apply_weather_data(self, data: dict):
+        """
+        Store the given weather data and publish the weather update.
+        """
+        self.temperature = data["current"]["temp_c"]
+        self.weather_condition = data["current"]["condition"]["text"]
+
+        Config.weather_condition = self.weather_condition
+        Config.temperature = self.temperature
+
+        event_manager.publish(
+            Event(
+                EventType.WEATHER_UPDATED,
+                {
+                    "condition": self.weather_condition,
+                    "temperature": self.temperature,
+                },
+            )
+        )
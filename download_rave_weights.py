@@ -1,8 +1,27 @@
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
+# One session per download thread, since sessions are not safe to share
+# between threads
+_thread_local = threading.local()
+
+
+def get_session():
+    """
+    Return the calling thread's session, creating it on first use. Reusing it
+    keeps connections to the same host open between requests.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        # Fetch the model archives as they are, without transfer compression
+        session.headers.update({"Accept-Encoding": "identity"})
+        _thread_local.session = session
+    return session
+
 
 def download_file(url, output_path):
     """
@@ -10,11 +29,13 @@ def download_file(url, output_path):
     """
     print(f"Downloading {url} to {output_path}...")
 
-    response = requests.get(url, stream=True)
+    response = get_session().get(url, stream=True)
     response.raise_for_status()
 
+    # Read in large chunks to keep the number of reads and writes low
     with open(output_path, "wb") as f:
-        shutil.copyfileobj(response.raw, f)
+        for chunk in response.iter_content(chunk_size=1 << 20):
+            f.write(chunk)
 
     print(f"Downloaded {output_path} successfully.")
 
@@ -43,9 +64,16 @@ def main():
         },
     ]
 
-    for model in models:
-        output_path = weights_dir / model["filename"]
-        download_file(model["url"], output_path)
+    # The models come from different hosts, so download them all at once
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        downloads = [
+            executor.submit(
+                download_file, model["url"], weights_dir / model["filename"]
+            )
+            for model in models
+        ]
+        for download in downloads:
+            download.result()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ import pygame
 from dotenv import load_dotenv
 
 from Config import Config
+from EventManager import event_manager
 from MIDISonifier import MIDISonifier
 from PendulumSystem import PendulumSystem
 from RAVESonifier import RAVESonifier
@@ -14,6 +15,17 @@ from WeatherAPI import WeatherAPI
 load_dotenv()
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 
+# The physics advances in fixed steps of PHYSICS_DT simulated seconds,
+# PHYSICS_RATE times per second of wall-clock time, whatever the frame rate.
+# That is 0.3 simulated seconds per second, the pace of the original loop,
+# which ran one 0.01 s step per frame at the 30 FPS its two clock ticks per
+# frame allowed. The steps are half as long, so the Euler trajectories differ
+# slightly from the original ones. At most MAX_PHYSICS_STEPS are run per
+# frame so a slow frame does not snowball into ever longer catch-ups.
+PHYSICS_DT = 0.005
+PHYSICS_RATE = 60
+MAX_PHYSICS_STEPS = 4
+
 
 if __name__ == "__main__":
     # Initialize pendulum system, visualizer, and sonifiers
@@ -51,28 +63,40 @@ if __name__ == "__main__":
     visualizer.update_location_weather_text()
     visualizer.update_gravity_text()
 
+    physics_time = 0.0
     running = True
     while running:
         time_delta = visualizer.clock.tick(60) / 1000.0
         visualizer.fill_background()
 
+        # Publish events posted from background threads, such as weather
+        # updates after a location change
+        event_manager.dispatch_posted()
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
             visualizer.handle_event(event)
 
-        pendulum_system.step(0.01)
+        physics_time += time_delta
+        # The epsilon keeps rounding error from turning a whole step of
+        # accumulated time into a frame without any step
+        physics_steps = int(physics_time * PHYSICS_RATE + 1e-6)
+        physics_time -= physics_steps / PHYSICS_RATE
+        for _ in range(min(physics_steps, MAX_PHYSICS_STEPS)):
+            pendulum_system.step(PHYSICS_DT)
 
         visualizer.update(pendulum_system, time_delta)
-        sonifier.update(pendulum_system.double_pendulums)
+        sonifier.update(pendulum_system)
 
         visualizer.draw(pendulum_system)
 
         pygame.display.flip()
-        visualizer.clock.tick(60)
 
     rave_sonifier.stop_audio()
     audio_thread.join()
+    rave_sonifier.close()
+    sonifier.close()
 
     pygame.quit()
@@ -2,7 +2,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from EventManager import EventType
 from MIDISonifier import Key, MIDISonifier, Mode, Scale
+from PendulumSystem import PendulumSystem
 
 
 class TestMIDISonifier:
@@ -21,6 +23,7 @@ class TestMIDISonifier:
             mock_config.key = "C"
             mock_config.scale = "MAJOR"
             mock_config.mode = "IONIAN"
+            mock_config.num_double_pendulums = 1
             yield mock_config
 
     @pytest.fixture
@@ -102,7 +105,7 @@ class TestMIDISonifier:
             )  # Should be part of C major
 
         # Check order of lower_notes_reversed (should be descending)
-        assert sonifier.lower_notes_reversed == sorted(
+        assert list(sonifier.lower_notes_reversed) == sorted(
             sonifier.lower_notes_reversed, reverse=True
         )
 
@@ -133,3 +136,182 @@ class TestMIDISonifier:
         # Verify C Minor
         for note in c_minor.upper_notes:
             assert note % 12 in c_minor_pitch_classes
+
+    def test_set_key_scale_mode_from_weather(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that the weather mapping is loaded once and reused."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+
+        with patch.object(MIDISonifier, "_WEATHER_MAP", None), patch.object(
+            MIDISonifier,
+            "_load_weather_map",
+            wraps=MIDISonifier._load_weather_map,
+        ) as mock_load:
+            sonifier.set_key_scale_mode_from_weather("Cloudy")
+            sonifier.set_key_scale_mode_from_weather("Cloudy")
+
+            mock_load.assert_called_once()
+
+        # Cloudy maps to A Minor Dorian in weather_music_mapping.json
+        assert sonifier.key == Key.A
+        assert sonifier.scale == Scale.MINOR
+        assert sonifier.mode == Mode.DORIAN
+
+    def test_pitch_tables_follow_weather_change(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that the pitch tables are rebuilt when the weather changes."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        sonifier._rebuild_pitch_tables(3)
+
+        assert bytes(sonifier.pitch_lower) == sonifier.lower_notes_reversed[:3]
+        assert bytes(sonifier.pitch_upper) == sonifier.upper_notes[:3]
+
+        sonifier._on_weather_changed(
+            MagicMock(data={"condition": "Cloudy", "temperature": 10})
+        )
+
+        a_minor_dorian_pitch_classes = {9, 11, 0, 2, 4, 6, 7}
+        assert len(sonifier.pitch_lower) == 3
+        for note in [*sonifier.pitch_lower, *sonifier.pitch_upper]:
+            assert note % 12 in a_minor_dorian_pitch_classes
+
+    def test_update_note_on_then_off(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that an active node plays a note that stops once inactive."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        send_message = mock_mido.open_output.return_value._rt.send_message
+        system = PendulumSystem()
+        double_pendulum = system.double_pendulums[0]
+        node = double_pendulum.pendulums[1].node
+        pitch = sonifier.upper_notes[0]
+
+        node.active = True
+        sonifier.update(system)
+
+        send_message.assert_called_once_with((0x91, pitch, 30))
+        assert node.prev_pitch == pitch
+        assert type(node.prev_pitch) is int
+        assert type(send_message.call_args.args[0][1]) is int
+
+        node.active = False
+        sonifier.update(system)
+
+        send_message.assert_called_with((0x81, pitch, 64))
+        assert node.prev_pitch is None
+
+        sonifier.update(system)
+        assert send_message.call_count == 2
+
+    def test_update_without_raw_port(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that ports without raw access are sent mido messages."""
+        mock_mido.Message.side_effect = lambda type, **kwargs: MagicMock(
+            type=type, **kwargs
+        )
+        midi_out = MagicMock(spec=["send"])
+        mock_mido.open_output.return_value = midi_out
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        system = PendulumSystem()
+        double_pendulum = system.double_pendulums[0]
+        node = double_pendulum.pendulums[1].node
+
+        node.active = True
+        sonifier.update(system)
+
+        note_on = midi_out.send.call_args.args[0]
+        assert note_on.type == "note_on"
+        assert note_on.channel == 1
+        assert note_on.note == sonifier.upper_notes[0]
+
+        node.active = False
+        sonifier.update(system)
+
+        note_off = midi_out.send.call_args.args[0]
+        assert note_off.type == "note_off"
+        assert note_off.channel == 1
+        assert note_off.note == sonifier.upper_notes[0]
+
+    def test_update_velocity_scales_with_gravity(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that note velocity follows gravity changes and is clamped."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        send_message = mock_mido.open_output.return_value._rt.send_message
+        system = PendulumSystem()
+        double_pendulum = system.double_pendulums[0]
+        pendulum = double_pendulum.pendulums[0]
+        pendulum.node.active = True
+
+        pendulum.angular_velocity = 3.0
+        sonifier.update(system)
+        assert send_message.call_args.args[0][2] == 60
+
+        double_pendulum.g = 9.81 / 2
+        sonifier.update(system)
+        assert send_message.call_args.args[0][2] == 120
+
+        pendulum.angular_velocity = -10.0
+        sonifier.update(system)
+        assert send_message.call_args.args[0][2] == 127
+
+        pendulum.angular_velocity = 0.1
+        sonifier.update(system)
+        assert send_message.call_args.args[0][2] == 30
+
+    def test_update_skips_idle_frames(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that update does nothing while no node is active or sounding."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        send_message = mock_mido.open_output.return_value._rt.send_message
+
+        system = PendulumSystem()
+        with patch.object(sonifier, "_flush") as flush:
+            sonifier.update(system)
+        flush.assert_not_called()
+
+        node = system.double_pendulums[0].pendulums[0].node
+        node.active = True
+        sonifier.update(system)
+        assert system.sounding_count == 1
+
+        node.active = False
+        sonifier.update(system)
+        assert system.sounding_count == 0
+        assert send_message.call_count == 2
+
+    def test_removed_pendulums_stop_their_notes(
+        self, mock_mido, mock_config, mock_event_manager
+    ):
+        """Test that notes of removed double pendulums are stopped."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        send_message = mock_mido.open_output.return_value._rt.send_message
+        system = PendulumSystem(n=2)
+        node = system.double_pendulums[1].pendulums[1].node
+        node.active = True
+        sonifier.update(system)
+        pitch = node.prev_pitch
+
+        system.update_number_of_pendulums(1)
+        assert system.sounding_count == 0
+
+        sonifier.update(system)
+        send_message.assert_called_with((0x81, pitch, 64))
+        assert node.prev_pitch is None
+
+    def test_close(self, mock_mido, mock_config, mock_event_manager):
+        """Test that closing silences the port and stops handling events."""
+        sonifier = MIDISonifier(key=Key.C, scale=Scale.MAJOR, mode=Mode.IONIAN)
+        midi_out = mock_mido.open_output.return_value
+
+        sonifier.close()
+
+        mock_event_manager.unsubscribe.assert_called_once_with(
+            EventType.WEATHER_UPDATED, sonifier._on_weather_changed
+        )
+        midi_out.reset.assert_called_once()
+        midi_out.close.assert_called_once()
@@ -2,6 +2,7 @@ import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+import torch
 
 from Config import Config
 from EventManager import Event, EventType
@@ -9,6 +10,43 @@ from PendulumSystem import DoublePendulum, Node, Pendulum, PendulumSystem
 from RAVESonifier import RAVESonifier
 
 
+class TinyRAVE(torch.nn.Module):
+    """
+    Stand-in for a RAVE model, decoding latents of any dimension into 2048
+    audio samples per latent column.
+    """
+
+    @torch.jit.export
+    def decode(self, z: torch.Tensor) -> torch.Tensor:
+        return torch.tanh(z.mean(dim=1, keepdim=True)).repeat_interleave(
+            2048, dim=-1
+        )
+
+    def forward(self, z: torch.Tensor) -> torch.Tensor:
+        return self.decode(z)
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("rave") / "tiny.ts"
+    torch.jit.script(TinyRAVE()).save(str(path))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def tiny_model(tiny_model_path):
+    # Every weights file loads the tiny scripted model, so the tests do not
+    # depend on the downloaded weights
+    jit_load = torch.jit.load
+    with patch(
+        "RAVESonifier.torch.jit.load",
+        side_effect=lambda weights_path, **kwargs: jit_load(
+            tiny_model_path, **kwargs
+        ),
+    ):
+        yield
+
+
 @pytest.fixture
 def mock_pendulum_system():
     # Create mock pendulum system
@@ -60,6 +98,13 @@ def default_config():
     return Config
 
 
+@pytest.fixture
+def sonifier(mock_pendulum_system, default_config):
+    sonifier = RAVESonifier(pendulum_system=mock_pendulum_system)
+    yield sonifier
+    sonifier.close()
+
+
 class TestRAVESonifierInitialization:
     def test_initialization_with_config_values(
         self,
@@ -158,6 +203,69 @@ class TestEventHandling:
         assert sonifier.weights_path == expected_weights_path
         assert sonifier.weights_path != original_weights
 
+    def test_model_swapped_in_background_on_weather_change(
+        self, sonifier, rave_weights_mapping
+    ):
+        original_model = sonifier.model
+
+        Config.weather_condition = "Blizzard"
+        sonifier._on_weather_changed(
+            Event(
+                EventType.WEATHER_UPDATED,
+                {"condition": "Blizzard", "temperature": -5},
+            )
+        )
+        # Wait for the background load to finish
+        sonifier.close()
+
+        settings = rave_weights_mapping[sonifier.weights_path]
+        assert sonifier.model is not original_model
+        assert sonifier.latent_dim == settings["latent_dim"]
+        assert sonifier.volume == settings["volume"]
+
+    def test_failed_background_load_is_reported(self, sonifier, capsys):
+        original_model = sonifier.model
+
+        Config.weather_condition = "Blizzard"
+        with patch("torch.jit.load", side_effect=RuntimeError("bad file")):
+            sonifier._on_weather_changed(
+                Event(
+                    EventType.WEATHER_UPDATED,
+                    {"condition": "Blizzard", "temperature": -5},
+                )
+            )
+            sonifier.close()
+
+        assert sonifier.model is original_model
+        assert "bad file" in capsys.readouterr().out
+
+    def test_model_prepared_for_new_pendulum_count(self, sonifier):
+        mock_model = MagicMock()
+        sonifier.model = mock_model
+
+        sonifier._on_pendulum_count_changed(
+            Event(EventType.PENDULUM_COUNT_CHANGED, 10)
+        )
+        # Wait for the background warm-up to finish
+        sonifier.close()
+
+        latents = mock_model.decode.call_args[0][0]
+        columns = -(-40 // sonifier.latent_dim)
+        assert latents.shape == (1, sonifier.latent_dim, columns)
+
+    def test_no_reload_after_close(self, sonifier):
+        sonifier.close()
+
+        with patch.object(sonifier, "_swap_model") as mock_swap:
+            sonifier._on_weather_changed(
+                Event(
+                    EventType.WEATHER_UPDATED,
+                    {"condition": "Blizzard", "temperature": -5},
+                )
+            )
+
+        mock_swap.assert_not_called()
+
     def test_on_moon_mode_changed(self, mock_pendulum_system, default_config):
         sonifier = RAVESonifier(pendulum_system=mock_pendulum_system)
 
@@ -225,3 +333,106 @@ class TestModelConfigurationChanges:
 
         # Should revert to original or something else
         assert sonifier.weights_path != initial_weights or not Config.moon_mode
+
+    def test_model_warmed_up_on_load(
+        self, mock_pendulum_system, default_config
+    ):
+        # The new model should decode a few silent buffers before it is used
+        mock_model = MagicMock()
+        with patch("RAVESonifier.torch.jit.load", return_value=mock_model):
+            sonifier = RAVESonifier(pendulum_system=mock_pendulum_system)
+
+        assert sonifier.model is mock_model
+        assert mock_model.decode.call_count >= 1
+        latents = mock_model.decode.call_args[0][0]
+        assert latents.shape == (1, sonifier.latent_dim, 1)
+        assert not latents.any()
+
+
+class TestSettingsMappings:
+    def test_mappings_loaded_once(self, mock_pendulum_system, default_config):
+        # The mapping files should only be read the first time settings load
+        with patch.object(
+            RAVESonifier, "_RAVE_WEIGHTS_MAP", None
+        ), patch.object(
+            RAVESonifier, "_WEATHER_WEIGHTS_MAP", None
+        ), patch.object(
+            RAVESonifier,
+            "_load_mappings",
+            wraps=RAVESonifier._load_mappings,
+        ) as mock_load:
+            sonifier = RAVESonifier(pendulum_system=mock_pendulum_system)
+            Config.weather_condition = "Blizzard"
+            sonifier._on_weather_changed(
+                Event(
+                    EventType.WEATHER_UPDATED,
+                    {"condition": "Blizzard", "temperature": -5},
+                )
+            )
+
+        assert mock_load.call_count == 1
+
+
+class TestLatentGeneration:
+    def test_generate_latents_from_pendulums(self, default_config):
+        pendulum_system = PendulumSystem(n=3)
+        pendulum_system.update_gravity(2.0)
+        for double_pendulum in pendulum_system.double_pendulums:
+            for pendulum in double_pendulum.pendulums:
+                pendulum.node.last_x = 300.0
+                pendulum.angular_velocity = 1.0
+
+        sonifier = RAVESonifier(
+            pendulum_system=pendulum_system, scaling_factor=200.0
+        )
+
+        # Without noise, each pendulum contributes its scaled position and
+        # angular velocity, and the unused latents are left at zero
+        def zero_noise(dtype, out):
+            out[:] = 0
+            return out
+
+        sonifier._rng = MagicMock(standard_normal=zero_noise)
+        latents = sonifier.generate_latents()
+
+        columns = -(-12 // sonifier.latent_dim)
+        assert latents.shape == (1, sonifier.latent_dim, columns)
+        flat = latents.flatten()
+        assert flat[:12].tolist() == [0.25] * 12
+        assert flat[12:].tolist() == [0.0] * (len(flat) - 12)
+
+    def test_generate_latents_after_resize(self, default_config):
+        pendulum_system = PendulumSystem(n=3)
+        sonifier = RAVESonifier(pendulum_system=pendulum_system)
+
+        pendulum_system.update_number_of_pendulums(5)
+        latents = sonifier.generate_latents()
+
+        columns = -(-20 // sonifier.latent_dim)
+        assert latents.shape == (1, sonifier.latent_dim, columns)
+        assert latents.isfinite().all()
+
+
+class TestAudioStreaming:
+    def test_stream_writes_blocks_until_stopped(self, default_config):
+        pendulum_system = PendulumSystem(n=2)
+        sonifier = RAVESonifier(
+            pendulum_system=pendulum_system, buffer_size=256
+        )
+
+        with patch("RAVESonifier.sd.OutputStream") as mock_stream_class:
+            mock_stream = mock_stream_class.return_value
+            written = []
+
+            def write(block):
+                written.append(block.copy())
+                if len(written) == 2:
+                    sonifier.stop_audio()
+
+            mock_stream.write.side_effect = write
+            sonifier.stream_audio()
+
+        assert len(written) == 2
+        assert written[0].shape == (256, 1)
+        mock_stream.abort.assert_called_once()
+        mock_stream.close.assert_called_once()
@@ -1,11 +1,12 @@
 import math
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pygame
 import pytest
 
 from EventManager import Event, EventType
-from PendulumSystem import DoublePendulum, Node, Pendulum, PendulumSystem
+from PendulumSystem import DoublePendulum, PendulumSystem
 from Visualizer import PendulumSystemVisualizer
 
 
@@ -86,38 +87,57 @@ class TestEventHandling:
 
 
 class TestRendering:
-    def test_convert_to_screen_coords(self, visualizer):
-        mock_dp = Mock(spec=DoublePendulum)
-        p1 = Mock(spec=Pendulum, angle=math.pi / 4, length=1.0)
-        p2 = Mock(spec=Pendulum, angle=math.pi / 2, length=1.0)
-        mock_dp.pendulums = [p1, p2]
-        visualizer.origin = (400, 300)
-        visualizer.scale = 100
-        coords = visualizer._convert_to_screen_coords(mock_dp)
-        assert coords[0] == (400, 300)
+    def test_system_screen_coords(self, visualizer):
+        pendulum_system = PendulumSystem(n=1)
+        pendulum_system._angle[...] = [[math.pi / 4, math.pi / 2]]
+        pendulum_system._length[...] = 1.0
+
+        coords = pendulum_system.screen_coords((400, 300), 100)
+
+        assert coords.shape == (1, 3, 2)
+        assert coords[0, 0].tolist() == [400, 300]
         assert math.isclose(
-            coords[1][0], 400 + 100 * math.sin(math.pi / 4), abs_tol=1
+            coords[0, 1, 0], 400 + 100 * math.sin(math.pi / 4), abs_tol=1e-9
         )
         assert math.isclose(
-            coords[2][0], coords[1][0] + 100 * math.sin(math.pi / 2), abs_tol=1
+            coords[0, 1, 1], 300 + 100 * math.cos(math.pi / 4), abs_tol=1e-9
+        )
+        assert math.isclose(
+            coords[0, 2, 0],
+            coords[0, 1, 0] + 100 * math.sin(math.pi / 2),
+            abs_tol=1e-9,
         )
 
     def test_draw_double_pendulum(self, visualizer):
-        with patch("pygame.draw.line") as mock_line, patch(
+        with patch("pygame.draw.lines") as mock_lines, patch(
             "pygame.draw.circle"
         ) as mock_circle:
-            mock_dp = Mock(spec=DoublePendulum)
-            p1, p2 = Mock(spec=Pendulum, mass=2.0), Mock(
-                spec=Pendulum, mass=1.0
-            )
-            mock_dp.pendulums = [p1, p2]
-            visualizer._convert_to_screen_coords = Mock(
-                return_value=[(400, 300), (450, 350), (500, 400)]
+            coords = [(400, 300), (450, 350), (500, 400)]
+            visualizer._draw_double_pendulum((255, 0, 0), coords, [12.0, 6.0])
+            mock_lines.assert_called_once_with(
+                visualizer.screen, (255, 0, 0), False, coords, 3
             )
-            visualizer._draw_double_pendulum(mock_dp, (255, 0, 0))
-            assert mock_line.call_count == 2
             assert mock_circle.call_count == 2
             assert mock_circle.call_args_list[0][0][2] == (450, 350)
+            assert mock_circle.call_args_list[0][0][3] == 12.0
+
+    def test_draw_reuses_coords_from_update(self, visualizer):
+        coords = [[400, 300], [450, 350], [500, 400]]
+        visualizer._draw_double_pendulum = Mock()
+        pendulum_system = visualizer.pendulum_system
+        pendulum_system.screen_coords.return_value = np.array([coords] * 2)
+        pendulum_system.masses = np.array([[2.0, 1.0]] * 2)
+
+        visualizer.update(pendulum_system, 0.016)
+        visualizer.draw(pendulum_system)
+
+        pendulum_system.screen_coords.assert_called_once_with(
+            visualizer.origin, visualizer.scale
+        )
+        pendulum_system.update_nodes.assert_called_once()
+        for call in visualizer._draw_double_pendulum.call_args_list:
+            assert call[0][1] == coords
+            assert call[0][2] == [12.0, 6.0]
 
     def test_get_background_color(self, visualizer):
         with patch("Visualizer.Config") as mock_config:
@@ -131,47 +151,32 @@ class TestRendering:
 class TestNodeStates:
     @pytest.fixture
     def setup(self):
-        pygame.init()
-
-        node1 = Node()
-        node2 = Node()
-
-        pendulum1 = Mock(spec=Pendulum)
-        pendulum1.node = node1
-        pendulum1.length = 1.0
-        pendulum1.angle = 0.0
-
-        pendulum2 = Mock(spec=Pendulum)
-        pendulum2.node = node2
-        pendulum2.length = 1.0
-        pendulum2.angle = 0.0
-
-        double_pendulum = Mock(spec=DoublePendulum)
-        double_pendulum.pendulums = [pendulum1, pendulum2]
-
-        pendulum_system = Mock(spec=PendulumSystem)
-        pendulum_system.double_pendulums = [double_pendulum]
+        pendulum_system = PendulumSystem(n=1)
+        node1, node2 = (
+            pendulum.node
+            for pendulum in pendulum_system.double_pendulums[0].pendulums
+        )
 
         screen_size = (800, 800)
-        visualizer = PendulumSystemVisualizer(
-            pendulum_system=pendulum_system, size=screen_size, scale=200
-        )
+        # Node updates never touch the display, so SDL is not initialised
+        with patch("pygame.init"), patch("pygame.display.set_mode"), patch(
+            "pygame.font.init"
+        ), patch("pygame.font.SysFont"), patch("Visualizer.Sidebar"):
+            visualizer = PendulumSystemVisualizer(
+                pendulum_system=pendulum_system, size=screen_size, scale=200
+            )
 
         origin_x = screen_size[0] // 2 + visualizer.sidebar_width
 
-        yield {
+        return {
             "visualizer": visualizer,
             "origin_x": origin_x,
             "screen_size": screen_size,
             "node1": node1,
             "node2": node2,
-            "pendulum1": pendulum1,
-            "pendulum2": pendulum2,
-            "double_pendulum": double_pendulum,
+            "pendulum_system": pendulum_system,
         }
 
-        pygame.quit()
-
     def test_node_activation_on_origin_crossing(self, setup):
         """Test that a node becomes active and triggered only once when crossing the origin."""
         visualizer = setup["visualizer"]
@@ -179,10 +184,17 @@ class TestNodeStates:
         screen_size = setup["screen_size"]
         node1 = setup["node1"]
         node2 = setup["node2"]
-        double_pendulum = setup["double_pendulum"]
+        pendulum_system = setup["pendulum_system"]
+
+        def update_nodes(coords):
+            pendulum_system.update_nodes(
+                np.array([coords], dtype=float),
+                origin_x,
+                visualizer.node_threshold,
+            )
 
-        # Mock the _convert_to_screen_coords method to return controlled coordinates
-        # We'll simulate a pendulum crossing the origin from right to left
+        # Screen coordinates of the single double pendulum, simulating a
+        # pendulum crossing the origin from right to left
 
         # First position: to the right of origin
         right_coords = [
@@ -225,10 +237,7 @@ class TestNodeStates:
 
         # Test sequence of movements:
         # 1. First update - initializes last_x but no crossing yet
-        with patch.object(
-            visualizer, "_convert_to_screen_coords", return_value=right_coords
-        ):
-            visualizer._update_node_states(double_pendulum)
+        update_nodes(right_coords)
 
         assert node1.last_x == right_coords[1][0]
         assert node2.last_x == right_coords[2][0]
@@ -238,10 +247,7 @@ class TestNodeStates:
         assert not node2.triggered
 
         # 2. Cross the origin from right to left - should activate and trigger nodes
-        with patch.object(
-            visualizer, "_convert_to_screen_coords", return_value=left_coords
-        ):
-            visualizer._update_node_states(double_pendulum)
+        update_nodes(left_coords)
 
         assert node1.last_x == left_coords[1][0]
         assert node2.last_x == left_coords[2][0]
@@ -254,10 +260,7 @@ class TestNodeStates:
         assert node2.triggered
 
         # 3. Continue moving left (no new crossing) - should deactivate and remain triggered
-        with patch.object(
-            visualizer, "_convert_to_screen_coords", return_value=left_coords2
-        ):
-            visualizer._update_node_states(double_pendulum)
+        update_nodes(left_coords2)
 
         assert node1.last_x == left_coords2[1][0]
         assert node2.last_x == left_coords2[2][0]
@@ -267,12 +270,7 @@ class TestNodeStates:
         assert node2.triggered
 
         # 4. Move far left (beyond threshold) - should reset triggered state
-        with patch.object(
-            visualizer,
-            "_convert_to_screen_coords",
-            return_value=far_left_coords,
-        ):
-            visualizer._update_node_states(double_pendulum)
+        update_nodes(far_left_coords)
 
         assert node1.last_x == far_left_coords[1][0]
         assert node2.last_x == far_left_coords[2][0]
@@ -282,10 +280,7 @@ class TestNodeStates:
         assert not node2.triggered
 
         # 5. Cross back to the right - should activate but only trigger the first node
-        with patch.object(
-            visualizer, "_convert_to_screen_coords", return_value=right_coords2
-        ):
-            visualizer._update_node_states(double_pendulum)
+        update_nodes(right_coords2)
 
         assert node1.last_x == right_coords2[1][0]
         assert node2.last_x == right_coords2[2][0]
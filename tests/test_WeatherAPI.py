@@ -1,4 +1,5 @@
 import json
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -6,7 +7,7 @@ import requests
 
 from Config import Config
 from EventManager import Event, EventType
-from WeatherAPI import WeatherAPI
+from WeatherAPI import CACHE_TTL, REQUEST_TIMEOUT, WeatherAPI
 
 
 @pytest.fixture
@@ -16,7 +17,7 @@ def weather_api():
     return WeatherAPI(api_key, location)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_weather_response():
     with open("tests/weather_response.json") as f:
         return json.load(f)
@@ -32,7 +33,7 @@ class TestWeatherAPIInitialization:
 
 
 class TestWeatherDataFetching:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_current_fetch_weather_data_success(
         self, mock_get, weather_api, mock_weather_response
     ):
@@ -55,9 +56,34 @@ class TestWeatherDataFetching:
                 "q": weather_api.location,
                 "key": weather_api.api_key,
             },
+            timeout=REQUEST_TIMEOUT,
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
+    def test_fetch_current_weather_data_cached(
+        self, mock_get, weather_api, mock_weather_response
+    ):
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_weather_response
+        mock_get.return_value = mock_response
+
+        with patch("WeatherAPI.event_manager") as mock_event_manager:
+            first = weather_api.fetch_current_weather_data()
+            second = weather_api.fetch_current_weather_data()
+
+            # The second fetch reuses the data but still publishes the update
+            assert first == second == mock_weather_response
+            mock_get.assert_called_once()
+            assert mock_event_manager.publish.call_count == 2
+
+            # Once the cached data expires the weather is fetched again
+            expired = time.monotonic() + CACHE_TTL
+            with patch("WeatherAPI.time.monotonic", return_value=expired):
+                weather_api.fetch_current_weather_data()
+            assert mock_get.call_count == 2
+            assert mock_event_manager.publish.call_count == 3
+
+    @patch("requests.Session.get")
     def test_fetch_current_weather_data_request_exception(
         self, mock_get, weather_api
     ):
@@ -74,7 +100,7 @@ class TestWeatherDataFetching:
         assert weather_api.temperature == Config.temperature
         assert weather_api.weather_condition == Config.weather_condition
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_fetch_weather_data_http_error(self, mock_get, weather_api):
         # Setup mock to raise HTTP error
         mock_response = MagicMock()
@@ -110,16 +136,22 @@ class TestEventHandling:
     def test_weather_fetch_error_on_location_change(
         self, mock_event_manager, weather_api
     ):
-        # Setup: Mock fetch_current_weather_data to return an empty result (failure)
+        # Setup: Mock the request to return an empty result (failure)
         old_location = "Test City"
         new_location = "Invalid City"
 
         with patch.object(
-            weather_api, "fetch_current_weather_data", return_value={}
+            weather_api, "_request_weather_data", return_value={}
         ):
             # Trigger location change
             event = Event(EventType.LOCATION_CHANGED, new_location)
             weather_api._on_location_changed(event)
+            # Wait for the location change to finish in the background
+            weather_api._executor.shutdown(wait=True)
+
+        # Nothing is applied until the main thread runs the posted callback
+        mock_event_manager.publish.assert_not_called()
+        mock_event_manager.post_call.call_args[0][0]()
 
         mock_event_manager.publish.assert_called_once()
         published_event = mock_event_manager.publish.call_args[0][0]
@@ -128,7 +160,7 @@ class TestEventHandling:
             "location": "Invalid City",
         }
 
-        # Verify location is reverted back to the old one
+        # Verify the old location is kept
         assert weather_api.location == old_location
 
     @patch("WeatherAPI.Config")
@@ -136,47 +168,87 @@ class TestEventHandling:
     def test_location_reverted_on_fetch_error(
         self, mock_event_manager, mock_config, weather_api
     ):
-        # Setup: Mock fetch_current_weather_data to return an empty result (failure)
+        # Setup: Mock the request to return an empty result (failure)
         old_location = "Test City"
         new_location = "Invalid City"
+        mock_config.location = new_location
 
         with patch.object(
-            weather_api, "fetch_current_weather_data", return_value={}
+            weather_api, "_request_weather_data", return_value={}
         ):
             # Trigger location change
             event = Event(EventType.LOCATION_CHANGED, new_location)
             weather_api._on_location_changed(event)
+            # Wait for the location change to finish in the background
+            weather_api._executor.shutdown(wait=True)
+        mock_event_manager.post_call.call_args[0][0]()
 
         # Verify location is reverted in both the API and Config
         assert weather_api.location == old_location
-        mock_config.location = (
-            old_location  # Verify Config location is reverted
-        )
+        assert mock_config.location == old_location
 
     def test_on_location_changed_success(self, weather_api):
-        # Setup: Mock fetch_current_weather_data to return success
+        # Setup: Mock the request to return success
         new_location = "New Test City"
 
         with patch.object(
             weather_api,
-            "fetch_current_weather_data",
+            "_request_weather_data",
             return_value={
                 "current": {"temp_c": 10, "condition": {"text": "Cloudy"}}
             },
-        ), patch("WeatherAPI.event_manager") as mock_event_manager:
+        ), patch("WeatherAPI.Config") as mock_config, patch(
+            "WeatherAPI.event_manager"
+        ) as mock_event_manager:
             # Trigger location change
             event = Event(EventType.LOCATION_CHANGED, new_location)
             weather_api._on_location_changed(event)
+            # Wait for the location change to finish in the background
+            weather_api._executor.shutdown(wait=True)
 
-        # Verify location is updated and NO error event is published
+            # The worker thread leaves the state untouched
+            assert weather_api.location == "Test City"
+            assert weather_api.temperature is None
+            mock_event_manager.post_call.call_args[0][0]()
+
+        # Verify location and weather are updated on the main thread and NO
+        # error event is published
         assert weather_api.location == new_location
-        for call in mock_event_manager.publish.call_args_list:
-            event = call[0][0]
-            assert event.event_type != EventType.WEATHER_FETCH_ERROR
+        assert mock_config.temperature == 10
+        published_event = mock_event_manager.publish.call_args[0][0]
+        assert published_event.type == EventType.WEATHER_UPDATED
+
+    @patch("WeatherAPI.Config")
+    @patch("WeatherAPI.event_manager")
+    def test_stale_location_change_ignored(
+        self, mock_event_manager, mock_config, weather_api
+    ):
+        # Setup: The first location fails, but a second one was already
+        # requested by the time its result reaches the main thread
+        mock_config.location = "Second City"
+
+        with patch.object(
+            weather_api, "_request_weather_data", return_value={}
+        ):
+            weather_api._on_location_changed(
+                Event(EventType.LOCATION_CHANGED, "First City")
+            )
+            weather_api._on_location_changed(
+                Event(EventType.LOCATION_CHANGED, "Second City")
+            )
+            weather_api._executor.shutdown(wait=True)
+
+        # Apply only the stale result of the first request
+        mock_event_manager.post_call.call_args_list[0][0][0]()
+
+        # Verify the newer choice is neither reverted nor reported
+        mock_event_manager.publish.assert_not_called()
+        assert mock_config.location == "Second City"
+        assert weather_api.location == "Test City"
 
 
 class TestWeatherDataParsing:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_parse_weather_data(self, mock_get, weather_api):
         # Test parsing of weather data
         mock_response = MagicMock()
@@ -193,7 +265,7 @@ class TestWeatherDataParsing:
         assert weather_api.temperature == 20.0
         assert weather_api.weather_condition == "Clear"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_parse_weather_data_missing_fields(self, mock_get, weather_api):
         # Test parsing when fields are missing
         mock_response = MagicMock()